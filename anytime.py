@@ -0,0 +1,76 @@
+import time
+import asyncio
+import threading
+from config import SLOTS
+from graph_core import equitable_coloring_steps, calculate_daily_load
+
+# CANCELLATION TOKEN: Thread-safe stop flag with an optional deadline (seconds from creation)
+class CancelToken:
+    def __init__(self, deadline=None):
+        self._event = threading.Event()
+        self._deadline = time.monotonic() + deadline if deadline is not None else None
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set() or (self._deadline is not None and time.monotonic() >= self._deadline)
+
+# ANYTIME RUN: Iterating yields improvement events; best() is valid at any point, before, during or after.
+# The hill climb only accepts improvements, so the current schedule is always the best one found so far.
+class AnytimeRun:
+    def __init__(self, graph, initial_coloring, student_data=None, token=None, slots=SLOTS):
+        self.graph, self.slots = graph, slots
+        self.token = token or CancelToken()
+        self.counters = {}
+        self._current = dict(initial_coloring)
+        self._steps = equitable_coloring_steps(graph, self._current, student_data, self.token, slots, self.counters)
+        self._best = (dict(initial_coloring), None)
+        self.finished = False
+
+    def __iter__(self):
+        for event in self._steps:
+            # Snapshot between events, so a reader on another thread never sees half of a swap
+            self._best = (dict(self._current), event['score'])
+            if event['event'] in ('idle', 'cancelled'): self.finished = True
+            yield event
+        self.finished = True
+
+    def cancel(self):
+        self.token.cancel()
+
+    def best(self):
+        schedule, score = self._best
+        return schedule, calculate_daily_load(self.graph, schedule, self.slots), score
+
+    def run(self):
+        for _ in self: pass
+        return self.best()
+
+# ASYNCIO BRIDGE: The search runs on the loop's default thread pool and its events are handed back through
+# a queue, so several runs and export I/O can share one event loop. Closing the stream cancels the run.
+async def stream_events(run):
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+
+    def pump():
+        try:
+            for event in run: loop.call_soon_threadsafe(queue.put_nowait, event)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    worker = loop.run_in_executor(None, pump)
+    try:
+        while True:
+            event = await queue.get()
+            if event is None: break
+            yield event
+    finally:
+        run.cancel()
+        await worker
+
+async def optimize_async(run, on_event=None):
+    async for event in stream_events(run):
+        if on_event is not None: on_event(event)
+    return run.best()
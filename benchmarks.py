@@ -0,0 +1,321 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import contextlib
+import tracemalloc
+from config import SLOTS, get_duration_minutes, get_end_time, is_within_work_hours, time_intervals_overlap
+from graph_core import create_scheduling_graph, standard_greedy_coloring, is_safe_to_place
+from graph_core import calculate_student_load_variance
+from occupancy import OccupancyTimeline
+from matrix_scoring import MatrixScorer
+from schedulers import run_initial_scheduler
+from metaheuristics import OPTIMIZER_ENGINES
+from exact_solver import cp_model
+from scoring import ScoreState
+from synthetic import generate_university
+from exporters import export_master_csv, export_individual_schedules, export_lecturer_schedules
+from verification import verify_schedule
+
+# REFERENCE CHECK: The string-based placement test the integer slot model replaced
+def _legacy_is_safe_to_place(graph, course, day, start_time, current_schedule):
+    if not is_within_work_hours(start_time, graph.nodes[course].get('credits', 0)):
+        return False
+
+    curr_end = get_end_time(start_time, get_duration_minutes(graph.nodes[course].get('credits', 0)))
+    for neighbor in graph.neighbors(course):
+        if neighbor in current_schedule:
+            n_day, n_start = current_schedule[neighbor]
+            if day == n_day:
+                n_end = get_end_time(n_start, get_duration_minutes(graph.nodes[neighbor].get('credits', 0)))
+                if time_intervals_overlap(start_time, curr_end, n_start, n_end):
+                    return False
+    return True
+
+# MICRO-BENCHMARK: Times every (course, slot) placement query against a full greedy schedule
+def bench_placement_check(courses, students, repeat=3):
+    graph = create_scheduling_graph(courses, students)
+    schedule = standard_greedy_coloring(graph)
+    legacy_schedule = SLOTS.decode_schedule(schedule)
+    queries = [(c, slot) for c in graph.nodes for slot in range(SLOTS.slot_count)]
+
+    for course, slot in queries:
+        day, start = SLOTS.decode(slot)
+        if is_safe_to_place(graph, course, slot, schedule) != \
+           _legacy_is_safe_to_place(graph, course, day, start, legacy_schedule):
+            raise AssertionError(f"Placement mismatch for {course} at {day} {start}")
+
+    legacy_queries = [(c, *SLOTS.decode(slot)) for c, slot in queries]
+    legacy_best, slot_best = float('inf'), float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for course, day, start in legacy_queries:
+            _legacy_is_safe_to_place(graph, course, day, start, legacy_schedule)
+        legacy_best = min(legacy_best, time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        for course, slot in queries:
+            is_safe_to_place(graph, course, slot, schedule)
+        slot_best = min(slot_best, time.perf_counter() - t0)
+
+    return {'queries': len(queries), 'legacy_s': legacy_best, 'slot_s': slot_best,
+            'speedup': legacy_best / slot_best if slot_best else float('inf')}
+
+# MICRO-BENCHMARK: Resource timelines against the graph-neighbor scan on the same queries
+def bench_occupancy_check(courses, students, repeat=3):
+    graph = create_scheduling_graph(courses, students)
+    schedule = standard_greedy_coloring(graph)
+    # Courses the greedy could not place have no slot to lift, so only placed courses are queried
+    queries = [(c, slot) for c in graph.nodes if c in schedule for slot in range(SLOTS.slot_count)]
+
+    # Each query leaves the course itself out, as the optimizer does while relocating it
+    timeline = OccupancyTimeline(graph, schedule)
+    for course, slot in queries:
+        others = {c: s for c, s in schedule.items() if c != course}
+        timeline.remove(course, schedule[course])
+        if timeline.is_free(course, slot) != is_safe_to_place(graph, course, slot, others):
+            raise AssertionError(f"Timeline mismatch for {course} at slot {slot}")
+        timeline.place(course, schedule[course])
+
+    scan_best, timeline_best = float('inf'), float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for course, slot in queries:
+            is_safe_to_place(graph, course, slot, schedule)
+        scan_best = min(scan_best, time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        for course, slot in queries:
+            timeline.is_free(course, slot)
+        timeline_best = min(timeline_best, time.perf_counter() - t0)
+
+    return {'queries': len(queries), 'scan_s': scan_best, 'timeline_s': timeline_best,
+            'speedup': scan_best / timeline_best if timeline_best else float('inf')}
+
+# MICRO-BENCHMARK: Vectorized student variance against the pure-Python reference objective
+def bench_vectorized_objective(courses, students, repeat=3):
+    graph = create_scheduling_graph(courses, students)
+    schedule = standard_greedy_coloring(graph)
+    scorer = MatrixScorer(graph, students)
+    assign = scorer.assignment(schedule)
+
+    reference = calculate_student_load_variance(students, schedule, graph)
+    if abs(scorer.student_variance(assign) - reference) > 1e-6 * max(1.0, abs(reference)):
+        raise AssertionError("Vectorized student variance disagrees with the reference")
+
+    ref_best, vec_best = float('inf'), float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        calculate_student_load_variance(students, schedule, graph)
+        ref_best = min(ref_best, time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        scorer.student_variance(scorer.assignment(schedule))
+        vec_best = min(vec_best, time.perf_counter() - t0)
+
+    return {'students': len(students), 'reference_s': ref_best, 'vectorized_s': vec_best,
+            'speedup': ref_best / vec_best if vec_best else float('inf')}
+
+# REFERENCE CHECK: Pairwise string-time overlap test over every pair of courses that share a resource
+def _pairwise_overlaps(graph, schedule):
+    found = set()
+    for u, v in graph.edges():
+        (u_day, u_start), (v_day, v_start) = schedule[u], schedule[v]
+        if u_day != v_day: continue
+        u_end = get_end_time(u_start, get_duration_minutes(graph.nodes[u].get('credits', 0)))
+        v_end = get_end_time(v_start, get_duration_minutes(graph.nodes[v].get('credits', 0)))
+        if time_intervals_overlap(u_start, u_end, v_start, v_end): found.add(frozenset((u, v)))
+    return found
+
+# MICRO-BENCHMARK: Sweep-line verification against the pairwise check on a deliberately clashing schedule
+def bench_verification(courses, students, repeat=3, seed=0):
+    graph = create_scheduling_graph(courses, students)
+    rng = random.Random(seed)
+    schedule = {c: SLOTS.decode(rng.randrange(SLOTS.slot_count)) for c in graph.nodes}
+
+    report = verify_schedule(schedule, courses, students)
+    swept = {frozenset(o['courses']) for o in report['overlaps']}
+    if swept != _pairwise_overlaps(graph, schedule):
+        raise AssertionError("Sweep-line and pairwise overlap sets differ")
+
+    pairwise_best, sweep_best = float('inf'), float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        _pairwise_overlaps(graph, schedule)
+        pairwise_best = min(pairwise_best, time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        verify_schedule(schedule, courses, students)
+        sweep_best = min(sweep_best, time.perf_counter() - t0)
+
+    return {'pairs': len(swept), 'pairwise_s': pairwise_best, 'sweep_s': sweep_best,
+            'speedup': pairwise_best / sweep_best if sweep_best else float('inf')}
+
+# REGRESSION ORACLE: Every optimizer engine must return a schedule that passes independent verification
+def verify_engines(courses, students, engines=None, time_budget=1.0, seed=0):
+    students = {k: set(v) for k, v in students.items()}
+    graph = create_scheduling_graph(courses, students)
+    with contextlib.redirect_stdout(io.StringIO()):
+        initial, _ = run_initial_scheduler(graph, 'auto')
+    if len(initial) != len(graph.nodes):
+        raise RuntimeError(f"Initial scheduler placed {len(initial)}/{len(graph.nodes)} courses")
+
+    rows = []
+    for engine in engines or OPTIMIZER_ENGINES:
+        # Without OR-Tools the exact engine is only the hill climb again, which proves nothing about CP-SAT
+        if engine == 'exact' and cp_model is None:
+            rows.append({'engine': engine, 'skipped': 'ortools missing'})
+            continue
+        budget = {} if engine == 'hill_climb' else {'time_budget': time_budget}
+        with contextlib.redirect_stdout(io.StringIO()):
+            final, _, _ = OPTIMIZER_ENGINES[engine](graph, initial, students, seed=seed, **budget)
+        report = verify_schedule(SLOTS.decode_schedule(final), courses, students)
+        rows.append({'engine': engine, 'ok': report['ok'], 'overlaps': len(report['overlaps']),
+                     'work_hours': len(report['work_hours']), 'placed': report['placed'],
+                     'score': ScoreState(graph, final, students).score()})
+    return rows
+
+# PIPELINE BENCHMARK: Times and memory-profiles every scheduling phase on one instance
+def run_pipeline_benchmark(courses, students, engine='hill_climb', time_budget=None, output_dir=None,
+                           track_memory=True):
+    phases = {}
+
+    def timed(name, fn, *args, **kwargs):
+        if track_memory: tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            value = fn(*args, **kwargs)
+        phases[name] = {'seconds': time.perf_counter() - t0}
+        if track_memory: phases[name]['peak_kb'] = tracemalloc.get_traced_memory()[1] / 1024
+        return value
+
+    if track_memory: tracemalloc.start()
+    try:
+        students = {k: set(v) for k, v in students.items()}
+        graph = timed('graph_build', create_scheduling_graph, courses, students)
+        schedule, report = timed('initial_schedule', run_initial_scheduler, graph, 'auto')
+        result = {'courses': len(courses), 'students': len(students), 'edges': graph.number_of_edges(),
+                  'placed': len(schedule), 'initial_strategy': report['strategy'], 'engine': engine}
+
+        if len(schedule) == len(graph.nodes):
+            budget = {} if engine == 'hill_climb' else {'time_budget': time_budget or 5.0}
+            final, _, _ = timed('optimizer', OPTIMIZER_ENGINES[engine], graph, schedule, students, **budget)
+            result['initial_score'] = ScoreState(graph, schedule, students).score()
+            result['final_score'] = ScoreState(graph, final, students).score()
+
+            with tempfile.TemporaryDirectory() as scratch:
+                folder = output_dir or scratch
+                view = SLOTS.decode_schedule(final)
+                timed('export_master', export_master_csv, graph, view, os.path.join(folder, 'master_schedule.csv'))
+                timed('export_students', export_individual_schedules, graph, view, students,
+                      os.path.join(folder, 'student_schedules'))
+                timed('export_lecturers', export_lecturer_schedules, graph, view,
+                      os.path.join(folder, 'lecturer_schedules'))
+            report = timed('verify', verify_schedule, view, courses, students)
+            result['verified'] = report['ok']
+    finally:
+        if track_memory: tracemalloc.stop()
+
+    result['phases'] = phases
+    return result
+
+# RESULT COMPARISON: Per-phase time ratios against an earlier benchmark file
+def compare_results(current, previous):
+    print(f"\n{'Phase':18} | {'Previous (s)':>12} | {'Current (s)':>12} | {'Ratio':>7}")
+    print("-" * 58)
+    for name, stats in current['phases'].items():
+        before = previous.get('phases', {}).get(name)
+        if before is None:
+            print(f"{name:18} | {'-':>12} | {stats['seconds']:12.4f} | {'new':>7}")
+            continue
+        ratio = stats['seconds'] / before['seconds'] if before['seconds'] else float('inf')
+        print(f"{name:18} | {before['seconds']:12.4f} | {stats['seconds']:12.4f} | {ratio:6.2f}x")
+
+def run_micro_benchmarks():
+    with open('courses.json', 'r', encoding='utf-8') as f: courses = json.load(f)
+    with open('students.json', 'r', encoding='utf-8') as f: students = {k: set(v) for k, v in json.load(f).items()}
+
+    result = bench_placement_check(courses, students)
+    print(f"Placement check: {result['queries']} queries | "
+          f"String: {result['legacy_s'] * 1000:.1f} ms | Slot mask: {result['slot_s'] * 1000:.1f} ms | "
+          f"Speedup: {result['speedup']:.1f}x")
+
+    result = bench_occupancy_check(courses, students)
+    print(f"Occupancy check: {result['queries']} queries | "
+          f"Neighbor scan: {result['scan_s'] * 1000:.1f} ms | Timeline: {result['timeline_s'] * 1000:.1f} ms | "
+          f"Speedup: {result['speedup']:.1f}x")
+
+    result = bench_verification(courses, students)
+    print(f"Verification: {result['pairs']} clashing pairs | "
+          f"Pairwise: {result['pairwise_s'] * 1000:.2f} ms | Sweep line: {result['sweep_s'] * 1000:.2f} ms | "
+          f"Speedup: {result['speedup']:.1f}x")
+
+    result = bench_vectorized_objective(courses, students)
+    print(f"Student variance: {result['students']} students | "
+          f"Reference: {result['reference_s'] * 1000:.2f} ms | Vectorized: {result['vectorized_s'] * 1000:.2f} ms | "
+          f"Speedup: {result['speedup']:.1f}x")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scheduling pipeline benchmarks")
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('micro', help="Placement and scoring micro-benchmarks on the bundled data")
+    oracle = sub.add_parser('oracle', help="Verify every optimizer engine's schedule on the bundled data")
+    oracle.add_argument('--time-budget', type=float, default=1.0)
+    pipe = sub.add_parser('pipeline', help="Per-phase timing on a synthetic university")
+    pipe.add_argument('--courses', type=int, default=200)
+    pipe.add_argument('--lecturers', type=int, default=60)
+    pipe.add_argument('--rooms', type=int, default=40)
+    pipe.add_argument('--students', type=int, default=1000)
+    pipe.add_argument('--courses-per-student', type=int, default=6)
+    pipe.add_argument('--credits', default='2:0.3,3:0.4,4:0.2,5:0.1', help="credit:weight pairs")
+    pipe.add_argument('--seed', type=int, default=0)
+    pipe.add_argument('--engine', default='hill_climb', choices=list(OPTIMIZER_ENGINES))
+    pipe.add_argument('--time-budget', type=float, default=None)
+    pipe.add_argument('--no-memory', action='store_true', help="Skip tracemalloc, which slows every phase")
+    pipe.add_argument('--output', default='benchmark_results.json')
+    pipe.add_argument('--compare', default=None, help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    if args.command == 'oracle':
+        with open('courses.json', 'r', encoding='utf-8') as f: courses = json.load(f)
+        with open('students.json', 'r', encoding='utf-8') as f: students = json.load(f)
+        rows = verify_engines(courses, students, time_budget=args.time_budget)
+        for row in rows:
+            if 'skipped' in row:
+                print(f"{row['engine']:14}: SKIP ({row['skipped']})")
+                continue
+            print(f"{row['engine']:14}: {'PASS' if row['ok'] else 'FAIL'} | Placed {row['placed']} | "
+                  f"Overlaps {row['overlaps']} | Work hours {row['work_hours']} | Score {row['score']:.2f}")
+        if not all(row['ok'] for row in rows if 'skipped' not in row): sys.exit(1)
+        return
+    if args.command != 'pipeline':
+        run_micro_benchmarks()
+        return
+
+    credit_weights = {int(k): float(v) for k, v in (pair.split(':') for pair in args.credits.split(','))}
+    params = {'courses': args.courses, 'lecturers': args.lecturers, 'rooms': args.rooms,
+              'students': args.students, 'courses_per_student': args.courses_per_student,
+              'credit_weights': credit_weights, 'seed': args.seed}
+    courses, students = generate_university(**params)
+    result = run_pipeline_benchmark(courses, students, args.engine, args.time_budget,
+                                    track_memory=not args.no_memory)
+    result['instance'] = {**params, 'credit_weights': {str(k): v for k, v in credit_weights.items()}}
+    result['python'] = platform.python_version()
+    result['timestamp'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    for name, stats in result['phases'].items():
+        peak = f" | Peak {stats['peak_kb']:.0f} KB" if 'peak_kb' in stats else ""
+        print(f"{name:18}: {stats['seconds']:.4f}s{peak}")
+    with open(args.output, 'w', encoding='utf-8') as f: json.dump(result, f, indent=4)
+    print(f"[Success] Benchmark results written: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f: compare_results(result, json.load(f))
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
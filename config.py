@@ -12,10 +12,10 @@ CONFIG = {
 
 # --- TIME GENERATION ---
 # Logic to generate valid start times based on the config
-def generate_available_start_times():
-    start = datetime.strptime(CONFIG['START_TIME'], '%H:%M')
-    end_limit = datetime.strptime(CONFIG['END_LIMIT'], '%H:%M')
-    interval = timedelta(minutes=CONFIG['SLOT_DURATION'])
+def generate_available_start_times(config=CONFIG):
+    start = datetime.strptime(config['START_TIME'], '%H:%M')
+    end_limit = datetime.strptime(config['END_LIMIT'], '%H:%M')
+    interval = timedelta(minutes=config['SLOT_DURATION'])
     
     times = []
     current = start
@@ -26,6 +26,56 @@ def generate_available_start_times():
 
 AVAILABLE_START_TIMES = generate_available_start_times()
 
+# --- INTEGER SLOT MODEL ---
+# Every (day, start index) pair is one int, laid out day-major so bit `slot` of a week-wide mask is that cell.
+# A course of N credits occupies the span mask (1 << N) - 1 shifted to its slot; overlap is a bitwise AND.
+# A model is also the per-run configuration: build one from any config dict and pass it as `slots=`.
+class SlotModel:
+    def __init__(self, config=CONFIG):
+        self.config = dict(config)
+        self.weight = config.get('STUDENT_WEIGHT', 1.0)
+        self.slot_duration = config['SLOT_DURATION']
+        self.days = list(config['DAYS'])
+        self.start_times = generate_available_start_times(config)
+        self.slots_per_day = len(self.start_times)
+        self.slot_count = self.slots_per_day * len(self.days)
+        self.day_index = {day: i for i, day in enumerate(self.days)}
+        self.start_index = {t: i for i, t in enumerate(self.start_times)}
+
+        # Slots that still end on or before END_LIMIT; spans never cross into the next day
+        start = datetime.strptime(config['START_TIME'], '%H:%M')
+        end_limit = datetime.strptime(config['END_LIMIT'], '%H:%M')
+        self.usable_slots = int((end_limit - start).total_seconds() // 60) // config['SLOT_DURATION']
+
+    def encode(self, day, start_time):
+        return self.day_index[day] * self.slots_per_day + self.start_index[start_time]
+
+    def decode(self, slot):
+        return (self.days[slot // self.slots_per_day], self.start_times[slot % self.slots_per_day])
+
+    def day_of(self, slot):
+        return slot // self.slots_per_day
+
+    def span(self, credits):
+        return (1 << credits) - 1 if credits > 0 else 0
+
+    def fits(self, span, slot):
+        return slot % self.slots_per_day + span.bit_length() <= self.usable_slots
+
+    def encode_schedule(self, schedule):
+        return {course: self.encode(day, start) for course, (day, start) in schedule.items()}
+
+    def decode_schedule(self, schedule):
+        return {course: self.decode(slot) for course, slot in schedule.items()}
+
+    def end_time(self, start_time, credits):
+        return get_end_time(start_time, credits * self.slot_duration)
+
+    def with_overrides(self, **overrides):
+        return SlotModel({**self.config, **overrides})
+
+SLOTS = SlotModel()
+
 # --- TIME MATH UTILITIES ---
 # Helper functions for duration and overlap calculations
 def get_duration_minutes(credits):
@@ -0,0 +1,136 @@
+import io
+import os
+import time
+import itertools
+import contextlib
+import networkx as nx
+from concurrent.futures import ProcessPoolExecutor
+from config import SLOTS
+from graph_core import calculate_daily_load
+from metaheuristics import OPTIMIZER_ENGINES
+from schedulers import run_initial_scheduler
+from occupancy import OccupancyTimeline
+from scoring import ScoreState
+
+# COMPONENT SPLIT: Courses that share no lecturer, room or student can never constrain each other
+def conflict_components(graph, student_data=None):
+    position = {course: i for i, course in enumerate(graph.nodes)}
+    components = sorted((sorted(c, key=position.get) for c in nx.connected_components(graph)),
+                        key=len, reverse=True)
+    owner = {course: i for i, members in enumerate(components) for course in members}
+
+    # Every student's courses form a clique, so each enrollment lands in exactly one component
+    students = [{} for _ in components]
+    for sid, courses in (student_data or {}).items():
+        placed = [c for c in courses if c in owner]
+        if placed: students[owner[placed[0]]][sid] = placed
+    return components, students
+
+def component_graph(graph, courses):
+    sub = graph.subgraph(courses).copy()
+    if 'resources' in graph.graph:
+        sub.graph['resources'] = {c: graph.graph['resources'][c] for c in courses}
+    return sub
+
+# WORKER STATE: The full graph is shipped once per process; tasks only carry course lists and enrollments
+_WORKER = {}
+
+def _init_worker(graph, slots):
+    _WORKER['graph'] = graph
+    _WORKER['slots'] = slots
+
+# A run budget is shared out by component size and never reaches past the run's deadline
+def _solve_component(courses, students, strategy='auto', engine='hill_climb', share=None, deadline=None, seed=0):
+    sub, slots = component_graph(_WORKER['graph'], courses), _WORKER['slots']
+    options = {'seed': seed, 'slots': slots}
+    if deadline is not None: options['time_budget'] = max(0.0, min(share, deadline - time.time()))
+    with contextlib.redirect_stdout(io.StringIO()):
+        initial, _ = run_initial_scheduler(sub, strategy, slots=slots)
+        if len(initial) != len(sub.nodes): return initial
+        schedule, _, _ = OPTIMIZER_ENGINES[engine](sub, initial, students, **options)
+    return schedule
+
+# GLOBAL BALANCING: Relabelling a component's days keeps it feasible and leaves every student's variance
+# unchanged, so only the shared per-day totals move; a move-only sweep then polishes across components
+def _relabel_days(graph, schedule, components, slots):
+    day_count = len(slots.days)
+    total = [0] * day_count
+    for members in sorted(components, key=lambda m: -sum(graph.nodes[c].get('credits', 0) for c in m)):
+        own = [0] * day_count
+        for c in members:
+            if c in schedule: own[slots.day_of(schedule[c])] += graph.nodes[c].get('credits', 0)
+
+        # Largest component first; its heaviest day goes to the lightest running total, and so on down
+        best = [0] * day_count
+        heavy = sorted(range(day_count), key=lambda d: -own[d])
+        light = sorted(range(day_count), key=lambda d: total[d])
+        for d, target in zip(heavy, light): best[d] = target
+        for d in range(day_count): total[best[d]] += own[d]
+        for c in members:
+            if c in schedule:
+                slot = schedule[c]
+                schedule[c] = best[slots.day_of(slot)] * slots.slots_per_day + slot % slots.slots_per_day
+    return schedule
+
+def _balance_moves(graph, schedule, student_data, slots, rounds=10):
+    schedule = dict(schedule)
+    state = ScoreState(graph, schedule, student_data, slots)
+    timeline = OccupancyTimeline(graph, schedule, slots)
+    for _ in range(rounds):
+        improved = False
+        for course in graph.nodes:
+            orig_slot = schedule[course]
+            orig_day = slots.day_of(orig_slot)
+            timeline.remove(course, orig_slot)
+            for slot in range(slots.slot_count):
+                # Same-day moves never change the objective
+                if slots.day_of(slot) == orig_day or not timeline.is_free(course, slot): continue
+                if state.apply_move(course, slot) < 0:
+                    state.commit()
+                    schedule[course] = slot
+                    improved = True
+                    break
+                state.rollback()
+            timeline.place(course, schedule[course])
+        if not improved: break
+    return schedule
+
+# DECOMPOSED OPTIMIZATION: Solves each component in a worker pool, then merges with the balancing pass
+def decomposed_optimize(graph, student_data, workers=None, strategy='auto', balance_rounds=10, slots=SLOTS,
+                        engine='hill_climb', time_budget=None, seed=0):
+    started = time.perf_counter()
+    if engine not in OPTIMIZER_ENGINES: raise ValueError(f"Unknown optimizer engine: {engine}")
+    components, students = conflict_components(graph, student_data)
+    if not components:
+        return {}, calculate_daily_load(graph, {}, slots), {'components': 0}
+    workers = min(workers or os.cpu_count() or 1, len(components))
+
+    # Each component's share of the budget is proportional to its course count
+    deadline = time.time() + time_budget if time_budget is not None else None
+    shares = [time_budget * len(m) / len(graph.nodes) if time_budget is not None else None for m in components]
+    tasks = (components, students, itertools.repeat(strategy), itertools.repeat(engine), shares,
+             itertools.repeat(deadline), itertools.repeat(seed))
+
+    schedule = {}
+    if workers == 1:
+        _init_worker(graph, slots)
+        for part in map(_solve_component, *tasks):
+            schedule.update(part)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(graph, slots)) as pool:
+            for part in pool.map(_solve_component, *tasks):
+                schedule.update(part)
+
+    if len(schedule) != len(graph.nodes):
+        print(f"[Warning] Decomposition placed {len(schedule)}/{len(graph.nodes)} courses.")
+        return None, None, {'components': len(components), 'placed': len(schedule)}
+
+    merged = ScoreState(graph, schedule, student_data, slots).score()
+    schedule = _relabel_days(graph, schedule, components, slots)
+    schedule = _balance_moves(graph, schedule, student_data, slots, balance_rounds)
+    score = ScoreState(graph, schedule, student_data, slots).score()
+    print(f"[Decomposition] {len(components)} components (largest {len(components[0])}) | "
+          f"Merged score: {merged:.2f} | Balanced score: {score:.2f}")
+    report = {'components': len(components), 'sizes': [len(m) for m in components], 'merged_score': merged,
+              'score': score, 'seconds': time.perf_counter() - started}
+    return schedule, calculate_daily_load(graph, schedule, slots), report
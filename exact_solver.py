@@ -0,0 +1,123 @@
+import os
+import time
+from fractions import Fraction
+from config import SLOTS
+from graph_core import equitable_coloring_optimized, calculate_daily_load
+from occupancy import course_resources
+
+# OR-Tools is optional; without it the exact engine always falls back to the hill climb
+try:
+    from ortools.sat.python import cp_model
+except ImportError:
+    cp_model = None
+
+MAX_VARIABLES = 200000
+
+def _members(resources):
+    members = {}
+    for course, keys in resources.items():
+        for key in keys: members.setdefault(key, []).append(course)
+    return members
+
+def _fallback(graph, initial_coloring, student_data, reason, instrument, slots):
+    print(f"[Exact] {reason}; falling back to hill climb.")
+    trace = []
+    schedule, load = equitable_coloring_optimized(graph, initial_coloring, student_data, trace=trace,
+                                                  verbose=False, instrument=instrument, slots=slots)
+    return schedule, load, trace
+
+# CP-SAT MODEL: One boolean per (course, feasible start slot); at most one course per resource per time bit.
+# Variance = sum of squared loads minus a constant, so the objective is an exact integer sum of squares.
+def exact_optimize(graph, initial_coloring, student_data=None, time_budget=10.0, max_evaluations=None, seed=0,
+                   threads=None, max_variables=MAX_VARIABLES, instrument=None, slots=SLOTS):
+    if cp_model is None:
+        return _fallback(graph, initial_coloring, student_data, "OR-Tools is not installed", instrument, slots)
+
+    allowed = {c: [s for s in range(slots.slot_count) if slots.fits(graph.nodes[c]['span'], s)]
+               for c in graph.nodes}
+    size = sum(len(starts) for starts in allowed.values())
+    if size > max_variables:
+        return _fallback(graph, initial_coloring, student_data,
+                         f"Model too large ({size} > {max_variables} variables)", instrument, slots)
+
+    started = time.perf_counter()
+    model = cp_model.CpModel()
+    x = {(c, s): model.NewBoolVar(f"x[{c},{s}]") for c, starts in allowed.items() for s in starts}
+    for c, starts in allowed.items():
+        model.AddExactlyOne(x[c, s] for s in starts)
+
+    # Student keys repeat the same course sets, so each distinct resource clique is encoded once
+    covering = {c: {} for c in graph.nodes}
+    for c, starts in allowed.items():
+        span = graph.nodes[c]['span']
+        for s in starts:
+            for bit in range(s, s + span.bit_length()):
+                if (span << s) >> bit & 1: covering[c].setdefault(bit, []).append(x[c, s])
+    cliques = {frozenset(m) for m in _members(course_resources(graph)).values() if len(m) > 1}
+    for members in cliques:
+        for bit in range(slots.slot_count):
+            literals = [lit for c in members for lit in covering[c].get(bit, ())]
+            if len(literals) > 1: model.AddAtMostOne(literals)
+
+    # Day indicators and squared loads; identical enrollment lists are merged with a multiplicity
+    days = range(len(slots.days))
+    credits = {c: graph.nodes[c].get('credits', 0) for c in graph.nodes}
+    on_day = {(c, d): sum(x[c, s] for s in allowed[c] if slots.day_of(s) == d) for c in graph.nodes for d in days}
+    groups = {}
+    for courses in (student_data or {}).values():
+        key = tuple(sorted(c for c in courses if c in credits))
+        if key: groups[key] = groups.get(key, 0) + 1
+
+    def squared(terms, upper, name):
+        load, sq = model.NewIntVar(0, upper, f"load[{name}]"), model.NewIntVar(0, upper * upper, f"sq[{name}]")
+        model.Add(load == sum(credits[c] * on_day[c, d] for c, d in terms))
+        model.AddMultiplicationEquality(sq, [load, load])
+        return sq
+
+    total = sum(credits.values())
+    glob_sq = [squared([(c, d) for c in graph.nodes], total, f"day{d}") for d in days]
+    stud_sq = []
+    for g, (key, count) in enumerate(groups.items()):
+        upper = sum(credits[c] for c in key)
+        stud_sq += [(count, squared([(c, d) for c in key], upper, f"g{g},{d}")) for d in days]
+
+    # The float student weight becomes an exact ratio so the CP-SAT objective stays integral
+    weight = Fraction(slots.weight).limit_denominator(1000)
+    model.Minimize(weight.denominator * sum(glob_sq) + weight.numerator * sum(n * sq for n, sq in stud_sq))
+    offset = (total ** 2 + float(weight) * sum(n * sum(credits[c] for c in key) ** 2
+                                               for key, n in groups.items())) / len(days)
+    to_score = lambda objective: objective / weight.denominator - offset
+
+    # Warm start from the heuristic schedule so the first incumbent is at least as good
+    for (c, s), var in x.items():
+        model.AddHint(var, initial_coloring.get(c) == s)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = float(time_budget if time_budget is not None else 10.0)
+    solver.parameters.num_workers = threads or os.cpu_count() or 1
+    solver.parameters.random_seed = seed
+
+    trace = []
+    class IncumbentTrace(cp_model.CpSolverSolutionCallback):
+        def on_solution_callback(self):
+            trace.append({'elapsed': time.perf_counter() - started, 'evaluations': len(trace) + 1,
+                          'score': to_score(self.ObjectiveValue()), 'bound': to_score(self.BestObjectiveBound())})
+
+    status = solver.Solve(model, IncumbentTrace())
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return _fallback(graph, initial_coloring, student_data,
+                         f"No incumbent ({solver.StatusName(status)})", instrument, slots)
+
+    schedule = {c: s for (c, s), var in x.items() if solver.Value(var)}
+    incumbent, bound = to_score(solver.ObjectiveValue()), to_score(solver.BestObjectiveBound())
+    gap = (incumbent - bound) / incumbent if incumbent > 1e-9 else 0.0
+    trace.append({'elapsed': time.perf_counter() - started, 'evaluations': len(trace), 'score': incumbent,
+                  'bound': bound, 'gap': gap, 'status': solver.StatusName(status)})
+
+    if instrument is not None:
+        instrument.count('exact_solutions', len(trace) - 1)
+        if instrument.hooks:
+            instrument.emit('exact', status=solver.StatusName(status), incumbent=incumbent, bound=bound, gap=gap)
+    print(f"[EXACT DONE] {solver.StatusName(status)} | Variables: {size} | Incumbent: {incumbent:.2f} | "
+          f"Bound: {bound:.2f} | Gap: {gap:.2%}")
+    return schedule, calculate_daily_load(graph, schedule, slots), trace
@@ -1,17 +1,21 @@
+import io
 import os
 import csv
-from config import CONFIG, AVAILABLE_START_TIMES, get_duration_minutes, get_end_time
+import zipfile
+import functools
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from config import SLOTS
 
 # EXPORT LOGIC: GENERATE SORTED MASTER SCHEDULE
-def export_master_csv(graph, coloring_result, filename='output/master_schedule.csv'):
+def export_master_csv(graph, coloring_result, filename='output/master_schedule.csv', slots=SLOTS):
     try:
         os.makedirs(os.path.dirname(filename), exist_ok=True)
-        day_order = {day: i for i, day in enumerate(CONFIG['DAYS'])}
+        day_order = {day: i for i, day in enumerate(slots.days)}
         master_data = []
 
         for course, (day, start) in coloring_result.items():
             node = graph.nodes[course]
-            end = get_end_time(start, get_duration_minutes(node['credits']))
+            end = slots.end_time(start, node['credits'])
             master_data.append({
                 'Course': course, 'Day': day, 'Start': start, 'End': end,
                 'Lecturer': node['lecturer'], 'Room': node['room'], 
@@ -27,67 +31,120 @@ def export_master_csv(graph, coloring_result, filename='output/master_schedule.c
                 writer.writerow([row['Course'], row['Day'], row['Start'], row['End'], row['Lecturer'], row['Room'], row['SKS']])
         
         print(f"[Success] Master schedule exported: {filename}")
+        return filename
     except Exception as e:
         print(f"[Error] Master export failed: {e}")
 
+# EXPORT HELPERS: Precomputed SKS block cells per course, shared by every timetable that lists it
+def _course_blocks(graph, coloring_result, tag, slots):
+    day_index, time_index = slots.day_index, slots.start_index
+    blocks = {}
+    for course, (day, start) in coloring_result.items():
+        node = graph.nodes[course]
+        row, col = time_index[start], day_index[day]
+        blocks[course] = [(row + i, col, f"[{tag}] {course} ({node['room']})" if i == 0 else f"[{course} Cont.]")
+                          for i in range(node['credits']) if row + i < slots.slots_per_day]
+    return blocks
+
+def _timetable_rows(courses, blocks, slots):
+    cells = {}
+    for c in courses:
+        for row, col, label in blocks.get(c, ()):
+            cells[(row, col)] = label
+    yield ['Time', *slots.days]
+    for row, t in enumerate(slots.start_times):
+        yield [t, *[cells.get((row, col), "") for col in range(len(slots.days))]]
+
+def _long_rows(entity, courses, blocks, slots):
+    for c in courses:
+        for row, col, label in blocks.get(c, ()):
+            yield [entity, slots.days[col], slots.start_times[row], c, label]
+
+# Students of one cohort share an enrollment list, so recently seen lists are rendered to text only once.
+# The LRU bounds memory to TIMETABLE_CACHE_SIZE texts however many distinct lists the export holds.
+TIMETABLE_CACHE_SIZE = 1024
+# Writes in flight per worker; the entity generator is only drawn as fast as files are written
+PENDING_PER_WORKER = 4
+
+def _timetable_renderer(blocks, slots):
+    @functools.lru_cache(maxsize=TIMETABLE_CACHE_SIZE)
+    def render(key):
+        buffer = io.StringIO(newline='')
+        csv.writer(buffer).writerows(_timetable_rows(key, blocks, slots))
+        return buffer.getvalue()
+    return lambda courses: render(tuple(courses))
+
+# EXPORT WRITERS: One CSV per entity (optionally on a thread pool), one zip archive, or one long table
+def _write_timetables(entities, blocks, folder, layout, workers, slots):
+    rendered = _timetable_renderer(blocks, slots)
+    if layout == 'files':
+        os.makedirs(folder, exist_ok=True)
+
+        def write(item):
+            name, text = item
+            with open(os.path.join(folder, f"{name}_schedule.csv"), 'w', newline='', encoding='utf-8') as f:
+                f.write(text)
+
+        entities = ((name, rendered(courses)) for name, courses in entities)
+
+        if workers and workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                pending = set()
+                for item in entities:
+                    if len(pending) >= workers * PENDING_PER_WORKER:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for job in done: job.result()
+                    pending.add(pool.submit(write, item))
+                for job in pending: job.result()
+        else:
+            for item in entities: write(item)
+        return folder
+
+    if layout == 'zip':
+        target = f"{folder}.zip"
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+            for name, courses in entities:
+                archive.writestr(f"{name}_schedule.csv", rendered(courses))
+        return target
+
+    if layout == 'long':
+        target = f"{folder}.csv"
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        with open(target, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Entity', 'Day', 'Time', 'Course', 'Label'])
+            for name, courses in entities:
+                writer.writerows(_long_rows(name, courses, blocks, slots))
+        return target
+
+    raise ValueError(f"Unknown export layout: {layout}")
+
 # EXPORT LOGIC: GENERATE STUDENT TIMETABLES WITH SKS BLOCKS
-def export_individual_schedules(graph, coloring_result, student_data, folder='output/student_schedules'):
+def export_individual_schedules(graph, coloring_result, student_data, folder='output/student_schedules',
+                                layout='files', workers=None, slots=SLOTS):
     try:
-        os.makedirs(folder, exist_ok=True)
-        days, times = CONFIG['DAYS'], AVAILABLE_START_TIMES
-
-        for sid, courses in student_data.items():
-            grid = {t: {d: "" for d in days} for t in times}
-            for c in courses:
-                if c in coloring_result:
-                    day, start = coloring_result[c]
-                    node = graph.nodes[c]
-                    start_idx = times.index(start)
-                    for i in range(node['credits']):
-                        if start_idx + i < len(times):
-                            label = f"[START] {c} ({node['room']})" if i == 0 else f"[{c} Cont.]"
-                            grid[times[start_idx + i]][day] = label
-
-            with open(f"{folder}/{sid}_schedule.csv", 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Time', *days])
-                for t in times:
-                    writer.writerow([t, *[grid[t][d] for d in days]])
-        
-        print(f"[Success] Student schedules exported to {folder}/")
+        blocks = _course_blocks(graph, coloring_result, 'START', slots)
+        entities = ((sid, courses) for sid, courses in student_data.items())
+        target = _write_timetables(entities, blocks, folder, layout, workers, slots)
+        print(f"[Success] Student schedules exported to {target}" + ("/" if layout == 'files' else ""))
+        return target
     except Exception as e:
         print(f"[Error] Student export failed: {e}")
 
 # EXPORT LOGIC: GENERATE LECTURER TIMETABLES WITH SKS BLOCKS
-def export_lecturer_schedules(graph, coloring_result, folder='output/lecturer_schedules'):
+def export_lecturer_schedules(graph, coloring_result, folder='output/lecturer_schedules', layout='files',
+                              workers=None, slots=SLOTS):
     try:
-        os.makedirs(folder, exist_ok=True)
-        days, times = CONFIG['DAYS'], AVAILABLE_START_TIMES
-        
         lecturers = {}
-        for course, (day, start) in coloring_result.items():
-            lec = graph.nodes[course]['lecturer']
-            if lec not in lecturers: lecturers[lec] = []
-            平衡_info = (course, day, start)
-            lecturers[lec].append(平衡_info)
-
-        for lec_name, assigned_courses in lecturers.items():
-            grid = {t: {d: "" for d in days} for t in times}
-            for c_code, day, start in assigned_courses:
-                node = graph.nodes[c_code]
-                start_idx = times.index(start)
-                for i in range(node['credits']):
-                    if start_idx + i < len(times):
-                        label = f"[CLASS] {c_code} ({node['room']})" if i == 0 else f"[{c_code} Cont.]"
-                        grid[times[start_idx + i]][day] = label
-
-            clean_name = "".join(x for x in lec_name if x.isalnum() or x in "._- ")
-            with open(f"{folder}/{clean_name}_schedule.csv", 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Time', *days])
-                for t in times:
-                    writer.writerow([t, *[grid[t][d] for d in days]])
-
-        print(f"[Success] Lecturer schedules exported to {folder}/")
+        for course in coloring_result:
+            lecturers.setdefault(graph.nodes[course]['lecturer'], []).append(course)
+
+        blocks = _course_blocks(graph, coloring_result, 'CLASS', slots)
+        entities = (("".join(x for x in lec_name if x.isalnum() or x in "._- "), courses)
+                    for lec_name, courses in lecturers.items())
+        target = _write_timetables(entities, blocks, folder, layout, workers, slots)
+        print(f"[Success] Lecturer schedules exported to {target}" + ("/" if layout == 'files' else ""))
+        return target
     except Exception as e:
-        print(f"[Error] Lecturer export failed: {e}")
\ No newline at end of file
+        print(f"[Error] Lecturer export failed: {e}")
@@ -1,163 +1,246 @@
+import time
 import networkx as nx
-from config import (
-    CONFIG, 
-    AVAILABLE_START_TIMES, 
-    get_duration_minutes, 
-    get_end_time, 
-    is_within_work_hours, 
-    time_intervals_overlap
-)
+from config import SLOTS
+from scoring import ScoreState
+from occupancy import OccupancyTimeline
+
+# RESOURCE INDEXING: Buckets course positions by lecturer, room and enrolled student group
+def index_course_resources(course_data, student_data):
+    position = {course: i for i, course in enumerate(course_data)}
+    index = {'Lecturer': {}, 'Room': {}, 'Student': {}, 'Group': {}}
+
+    for course, detail in course_data.items():
+        index['Lecturer'].setdefault(detail.get('lecturer'), []).append(position[course])
+        index['Room'].setdefault(detail.get('required_room'), []).append(position[course])
+
+    for sid, courses in student_data.items():
+        enrolled = sorted({position[c] for c in courses if c in position})
+        if enrolled:
+            index['Student'][sid] = enrolled
+            index['Group'].setdefault(frozenset(courses), enrolled)
+    return index
 
 # GRAPH CONSTRUCTION: Builds a conflict network where edges represent resource or student overlaps
-def create_scheduling_graph(course_data, student_data):
+def create_scheduling_graph(course_data, student_data, weighted=False):
     graph = nx.Graph()
     for course, detail in course_data.items():
         graph.add_node(course, 
                        credits=detail.get('credits', 0), 
                        lecturer=detail.get('lecturer', 'N/A'), 
-                       room=detail.get('required_room', 'N/A'))
+                       room=detail.get('required_room', 'N/A'),
+                       sem=detail.get('sem', 'N/A'),
+                       span=SLOTS.span(detail.get('credits', 0)))
 
+    # Only pairs sharing a bucket can conflict, so the cost follows the number of real conflicts
     course_list = list(course_data.keys())
-    for i in range(len(course_list)):
-        for j in range(i + 1, len(course_list)):
-            c1, c2 = course_list[i], course_list[j]
-            d1, d2 = course_data[c1], course_data[c2]
-            
-            reasons = []
-            if d1.get('lecturer') == d2.get('lecturer'): reasons.append("Lecturer")
-            if d1.get('required_room') == d2.get('required_room'): reasons.append("Room")
-            
-            for students in student_data.values():
-                if c1 in students and c2 in students:
-                    reasons.append("Student")
-                    break
-            
-            if reasons:
-                graph.add_edge(c1, c2, reason=", ".join(reasons))
+    index = index_course_resources(course_data, student_data)
+    resources = {course: [('Lecturer', detail.get('lecturer')), ('Room', detail.get('required_room'))]
+                 for course, detail in course_data.items()}
+    # Students with the same enrollment list share one group key, so a course holds one key per distinct
+    # list rather than one per student and the timeline check stays independent of class size
+    for group, members in index['Group'].items():
+        for m in members: resources[course_list[m]].append(('Student', group))
+    graph.graph['resources'] = {course: tuple(keys) for course, keys in resources.items()}
+
+    pairs = {}
+    for reason in ('Lecturer', 'Room'):
+        for members in index[reason].values():
+            for a in range(len(members)):
+                for b in range(a + 1, len(members)):
+                    pairs.setdefault((members[a], members[b]), {})[reason] = 1
+
+    for members in index['Student'].values():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                flags = pairs.setdefault((members[a], members[b]), {})
+                flags['Student'] = flags.get('Student', 0) + 1
+
+    # Edges are inserted in the original pair-scan order to keep adjacency iteration identical
+    for i, j in sorted(pairs):
+        flags = pairs[(i, j)]
+        reasons = [r for r in ('Lecturer', 'Room', 'Student') if r in flags]
+        if weighted:
+            graph.add_edge(course_list[i], course_list[j], reason=", ".join(reasons), weight=flags.get('Student', 0))
+        else:
+            graph.add_edge(course_list[i], course_list[j], reason=", ".join(reasons))
     return graph
 
 # CONSTRAINT VALIDATION: Checks for time overlaps and resource conflicts with existing neighbors
-def is_safe_to_place(graph, course, day, start_time, current_schedule):
-    if not is_within_work_hours(start_time, graph.nodes[course].get('credits', 0)):
+def is_safe_to_place(graph, course, slot, current_schedule, slots=SLOTS):
+    nodes = graph.nodes
+    span = nodes[course]['span']
+    if not slots.fits(span, slot):
         return False
 
-    curr_dur = get_duration_minutes(graph.nodes[course].get('credits', 0))
-    curr_end = get_end_time(start_time, curr_dur)
-
-    for neighbor in graph.neighbors(course):
-        if neighbor in current_schedule:
-            n_day, n_start = current_schedule[neighbor]
-            if day == n_day:
-                n_dur = get_duration_minutes(graph.nodes[neighbor].get('credits', 0))
-                n_end = get_end_time(n_start, n_dur)
-                if time_intervals_overlap(start_time, curr_end, n_start, n_end):
-                    return False
+    # Slots are day-major bit positions, so a single AND covers both the day and the time overlap
+    mask = span << slot
+    for neighbor in graph[course]:
+        n_slot = current_schedule.get(neighbor)
+        if n_slot is not None and (nodes[neighbor]['span'] << n_slot) & mask:
+            return False
     return True
 
 # INITIAL SCHEDULING: Highest-degree-first greedy coloring to establish a valid baseline
-def standard_greedy_coloring(graph):
+def standard_greedy_coloring(graph, instrument=None, slots=SLOTS):
     nodes_sorted = sorted(graph.nodes(), key=lambda n: graph.degree[n], reverse=True)
     result = {}
+    timeline = OccupancyTimeline(graph, slots=slots)
+    checks = 0
     
     for course in nodes_sorted:
         placed = False
-        for day in CONFIG['DAYS']:
-            for start in AVAILABLE_START_TIMES:
-                if is_safe_to_place(graph, course, day, start, result):
-                    result[course] = (day, start)
-                    placed = True
-                    break
-            if placed: break
+        for slot in range(slots.slot_count):
+            checks += 1
+            if timeline.is_free(course, slot):
+                result[course] = slot
+                timeline.place(course, slot)
+                placed = True
+                break
             
         if not placed:
             print(f"[Warning] Course {course} could not be placed in any slot.")
-            
+
+    if instrument is not None:
+        instrument.count('placement_checks', checks)
+        instrument.count('greedy_placed', len(result))
     return result
 
 # METRICS CALCULATION: Quantifies daily credit loads and student schedule variance
-def calculate_daily_load(graph, result):
-    load = {day: 0 for day in CONFIG['DAYS']}
-    for course, (day, _) in result.items():
-        load[day] += graph.nodes[course].get('credits', 0)
+def calculate_daily_load(graph, result, slots=SLOTS):
+    load = {day: 0 for day in slots.days}
+    for course, slot in result.items():
+        load[slots.days[slots.day_of(slot)]] += graph.nodes[course].get('credits', 0)
     return load
 
-def calculate_student_load_variance(student_data, result, graph):
+def calculate_student_load_variance(student_data, result, graph, slots=SLOTS):
     total_var = 0
     if not student_data: return 0
     for courses in student_data.values():
-        daily = {day: 0 for day in CONFIG['DAYS']}
+        daily = {day: 0 for day in slots.days}
         for c in courses:
             if c in result:
-                daily[result[c][0]] += graph.nodes[c].get('credits', 0)
-        mean = sum(daily.values()) / len(CONFIG['DAYS'])
+                daily[slots.days[slots.day_of(result[c])]] += graph.nodes[c].get('credits', 0)
+        mean = sum(daily.values()) / len(slots.days)
         total_var += sum((x - mean)**2 for x in daily.values())
     return total_var
 
 # EQUITABLE OPTIMIZATION: Iterative local search to minimize global and student load variance
-def equitable_coloring_optimized(graph, initial_coloring, student_data=None):
-    current = initial_coloring.copy()
-    stats = {"move": 0, "swap": 0, "history": []}
-    
-    def get_score(col):
-        load = calculate_daily_load(graph, col)
-        mean = sum(load.values()) / len(CONFIG['DAYS'])
-        glob_var = sum((x - mean)**2 for x in load.values())
-        stud_var = calculate_student_load_variance(student_data, col, graph)
-        return glob_var + (CONFIG.get('STUDENT_WEIGHT', 1.0) * stud_var)
-
-    initial_score = get_score(current)
-    print(f"\n[STARTING BALANCED OPTIMIZATION - MOVE & SWAP MODE]")
-    print(f"Initial System Inequity Score: {initial_score:.2f}")
-
-    for i in range(1, 101):
-        improved = False
-        curr_score = get_score(current)
-        nodes = list(graph.nodes)
-        
-        for node in nodes:
-            orig_day, orig_start = current[node]
-            credits = graph.nodes[node].get('credits', 0)
-            orig_end = get_end_time(orig_start, get_duration_minutes(credits))
-            
-            for d in CONFIG['DAYS']:
-                for s in AVAILABLE_START_TIMES:
-                    if (d, s) == (orig_day, orig_start): continue
-                    if is_safe_to_place(graph, node, d, s, current):
-                        current[node] = (d, s)
-                        new_score = get_score(current)
-                        if new_score < curr_score:
-                            new_end = get_end_time(s, get_duration_minutes(credits))
-                            print(f" > Step {i:2} [MOVE]: {node:12} from {orig_day[:3]} to {d[:3]} {s} | Score: {new_score:.2f}")
-                            stats["move"] += 1
-                            improved = True
-                            break
-                        current[node] = (orig_day, orig_start)
-                if improved: break
-            if improved: break
-
-        if not improved:
-            for i_idx in range(len(nodes)):
-                for j_idx in range(i_idx + 1, len(nodes)):
-                    n1, n2 = nodes[i_idx], nodes[j_idx]
-                    slot1, slot2 = current[n1], current[n2]
-                    if slot1[0] == slot2[0]: continue
-                    
-                    temp_sched = current.copy()
-                    temp_sched[n1], temp_sched[n2] = slot2, slot1
-                    
-                    if is_safe_to_place(graph, n1, slot2[0], slot2[1], temp_sched) and \
-                       is_safe_to_place(graph, n2, slot1[0], slot1[1], temp_sched):
-                        new_score = get_score(temp_sched)
-                        if new_score < curr_score:
-                            current = temp_sched
-                            print(f" > Step {i:2} [SWAP]: {n1:12} <-> {n2:12} | Score: {new_score:.2f}")
-                            stats["swap"] += 1
+# Generator core: mutates `current` in place and yields an event after each accepted improvement, so callers
+# can watch progress, stop early, and keep the schedule as it stands. `cancel` is any object with .cancelled.
+def equitable_coloring_steps(graph, current, student_data=None, cancel=None, slots=SLOTS, counters=None):
+    state = ScoreState(graph, current, student_data, slots)
+    timeline = OccupancyTimeline(graph, current, slots)
+    counters = counters if counters is not None else {}
+    started, evaluations, checks = time.perf_counter(), 0, 0
+    event = lambda kind, **fields: {'event': kind, **fields, 'score': state.score(),
+                                    'elapsed': time.perf_counter() - started, 'evaluations': evaluations}
+    stopped = lambda: cancel is not None and cancel.cancelled
+
+    yield event('start', iteration=0)
+    try:
+        for i in range(1, 101):
+            improved = False
+            nodes = list(graph.nodes)
+
+            for node in nodes:
+                if stopped():
+                    yield event('cancelled', iteration=i - 1)
+                    return
+                orig_slot = current[node]
+                timeline.remove(node, orig_slot)
+
+                for slot in range(slots.slot_count):
+                    if slot == orig_slot: continue
+                    checks += 1
+                    if timeline.is_free(node, slot):
+                        evaluations += 1
+                        if state.apply_move(node, slot) < 0:
+                            state.commit()
+                            current[node] = slot
+                            timeline.place(node, slot)
                             improved = True
                             break
-                if improved: break
+                        state.rollback()
+                if improved:
+                    yield event('move', iteration=i, course=node, origin=orig_slot, slot=slot)
+                    break
+                timeline.place(node, orig_slot)
 
-        if not improved:
-            print(f"[OPTIMIZATION IDLE] Finished after {i-1} iterations. Moves: {stats['move']}, Swaps: {stats['swap']}")
-            break
-            
-    return current, calculate_daily_load(graph, current)
\ No newline at end of file
+            if not improved:
+                for i_idx in range(len(nodes)):
+                    if stopped():
+                        yield event('cancelled', iteration=i - 1)
+                        return
+                    for j_idx in range(i_idx + 1, len(nodes)):
+                        n1, n2 = nodes[i_idx], nodes[j_idx]
+                        slot1, slot2 = current[n1], current[n2]
+                        if slots.day_of(slot1) == slots.day_of(slot2): continue
+
+                        # Swap on the timelines and undo on rejection instead of copying the schedule per pair.
+                        # The pair sits on different days, so checking n1 before n2 is re-placed is equivalent.
+                        timeline.remove(n1, slot1)
+                        timeline.remove(n2, slot2)
+                        n1_free = timeline.is_free(n1, slot2)
+                        checks += 1 + n1_free
+                        if n1_free: timeline.place(n1, slot2)
+                        if n1_free and timeline.is_free(n2, slot1):
+                            evaluations += 1
+                            if state.apply_swap(n1, n2) < 0:
+                                state.commit()
+                                current[n1], current[n2] = slot2, slot1
+                                timeline.place(n2, slot1)
+                                improved = True
+                                break
+                            state.rollback()
+                        if n1_free: timeline.remove(n1, slot2)
+                        timeline.place(n1, slot1)
+                        timeline.place(n2, slot2)
+                    if improved:
+                        yield event('swap', iteration=i, courses=(n1, n2))
+                        break
+
+            if not improved:
+                yield event('idle', iteration=i - 1)
+                return
+    finally:
+        counters['placement_checks'] = checks
+        counters['score_evaluations'] = evaluations
+
+def equitable_coloring_optimized(graph, initial_coloring, student_data=None, trace=None, verbose=True,
+                                 instrument=None, slots=SLOTS, cancel=None):
+    current = initial_coloring.copy()
+    stats = {"move": 0, "swap": 0, "history": trace if trace is not None else []}
+    counters = {}
+
+    for step in equitable_coloring_steps(graph, current, student_data, cancel, slots, counters):
+        kind, i, score = step['event'], step['iteration'], step['score']
+        stats["history"].append({'elapsed': step['elapsed'], 'evaluations': step['evaluations'], 'score': score})
+        if kind == 'start':
+            print(f"\n[STARTING BALANCED OPTIMIZATION - MOVE & SWAP MODE]")
+            print(f"Initial System Inequity Score: {score:.2f}")
+        elif kind == 'move':
+            if verbose:
+                orig_day, (d, s) = slots.decode(step['origin'])[0], slots.decode(step['slot'])
+                print(f" > Step {i:2} [MOVE]: {step['course']:12} from {orig_day[:3]} to {d[:3]} {s} | Score: {score:.2f}")
+            if instrument is not None and instrument.hooks:
+                instrument.emit('move', iteration=i, course=step['course'], slot=step['slot'], score=score)
+            stats["move"] += 1
+        elif kind == 'swap':
+            if verbose:
+                n1, n2 = step['courses']
+                print(f" > Step {i:2} [SWAP]: {n1:12} <-> {n2:12} | Score: {score:.2f}")
+            if instrument is not None and instrument.hooks:
+                instrument.emit('swap', iteration=i, courses=step['courses'], score=score)
+            stats["swap"] += 1
+        else:
+            # Terminal events repeat the last score; they are not history points
+            stats["history"].pop()
+            label = "IDLE" if kind == 'idle' else "CANCELLED"
+            print(f"[OPTIMIZATION {label}] Finished after {i} iterations. Moves: {stats['move']}, Swaps: {stats['swap']}")
+
+    if instrument is not None:
+        instrument.count('placement_checks', counters['placement_checks'])
+        instrument.count('score_evaluations', counters['score_evaluations'])
+        instrument.count('accepted_moves', stats['move'])
+        instrument.count('accepted_swaps', stats['swap'])
+    return current, calculate_daily_load(graph, current, slots)
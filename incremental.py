@@ -0,0 +1,246 @@
+import time
+from config import SLOTS
+from graph_core import calculate_daily_load
+from occupancy import OccupancyTimeline
+from scoring import ScoreState
+
+REASONS = ('Lecturer', 'Room', 'Student')
+
+# INCREMENTAL RE-SCHEDULING: Patches a compiled graph and its published schedule for small registrar edits
+class IncrementalScheduler:
+    def __init__(self, graph, schedule, course_data, student_data, max_depth=2, max_blockers=2, budget=2000,
+                 rounds=20, slots=SLOTS):
+        self.graph = graph
+        self.slots = slots
+        self.schedule = dict(schedule)
+        self.courses = dict(course_data.items())
+        self.students = {sid: set(codes) for sid, codes in student_data.items()}
+        self.max_depth, self.max_blockers, self.budget, self.rounds = max_depth, max_blockers, budget, rounds
+
+        # Reverse indexes: resource key -> courses holding it, course code -> enrolled students
+        self.resources = graph.graph['resources']
+        self.members = {}
+        for course, keys in self.resources.items():
+            for key in keys: self.members.setdefault(key, set()).add(course)
+        self.enrolled = {}
+        for sid, codes in self.students.items():
+            for c in codes: self.enrolled.setdefault(c, set()).add(sid)
+        self.timeline = OccupancyTimeline(graph, self.schedule, slots)
+        # One score state lives as long as the scheduler and is only ever patched, never rebuilt
+        self.state = ScoreState(graph, self.schedule, self.students, slots)
+        self.journal, self.origin = [], {}
+        self.tried = self.limit = 0
+
+    # PUBLIC EDITS: Each returns the update report; the rest of the schedule only moves inside the neighborhood
+    def upsert_course(self, code, detail, optimize=True):
+        return self.update(courses={code: detail}, optimize=optimize)
+
+    def remove_course(self, code, optimize=True):
+        return self.update(removed=[code], optimize=optimize)
+
+    def set_enrollment(self, sid, codes, optimize=True):
+        return self.update(enrollments={sid: codes}, optimize=optimize)
+
+    def update(self, courses=None, enrollments=None, removed=(), optimize=True):
+        start = time.perf_counter()
+        changed = set(courses or {}) | {c for c in removed if c in self.courses}
+
+        for code, detail in (courses or {}).items():
+            self.courses[code] = detail
+        for code in removed:
+            self.courses.pop(code, None)
+
+        # Only courses gaining or losing a student change their conflict edges; the courses the student keeps
+        # only swap the student's group key and are re-keyed in place
+        rekey = set()
+        for sid, codes in (enrollments or {}).items():
+            old, new = self.students.get(sid, set()), set(codes or ())
+            for c in old - new: self.enrolled[c].discard(sid)
+            for c in new - old: self.enrolled.setdefault(c, set()).add(sid)
+            changed |= {c for c in old ^ new if c in self.graph or c in self.courses}
+            if old != new: rekey |= {c for c in old & new if c in self.graph}
+            if codes is None: self.students.pop(sid, None)
+            else: self.students[sid] = new
+
+        # Lift the affected courses off the timeline and out of the score under their old data, then patch
+        # the graph. `origin` records the first slot of every course this update touches.
+        changed = sorted(changed)
+        self.origin = {c: self.schedule.get(c) for c in changed}
+        for course in changed:
+            if course in self.schedule: self.timeline.remove(course, self.schedule[course])
+            self.state.unplace(course)
+        for course in sorted(rekey - set(changed)):
+            slot = self.schedule.get(course)
+            if slot is not None: self.timeline.remove(course, slot)
+            self._rekey(course)
+            if slot is not None: self.timeline.place(course, slot)
+        for course in changed:
+            self._relink(course)
+            detail = self.courses.get(course)
+            self.state.set_course(course, detail.get('credits', 0) if detail is not None else None,
+                                  sorted(self.enrolled.get(course, ())) if detail is not None else None)
+
+        # Courses whose slot still holds keep it; the rest are re-inserted with a bounded ejection chain
+        pending = []
+        for course in changed:
+            slot = self.schedule.get(course)
+            if course not in self.courses:
+                self.schedule.pop(course, None)
+            elif slot is not None and self.timeline.is_free(course, slot):
+                self.timeline.place(course, slot)
+            else:
+                self.schedule.pop(course, None)
+                pending.append(course)
+
+        unplaced = []
+        for course in sorted(pending, key=lambda n: self.graph.degree[n], reverse=True):
+            self.journal, self.limit = [], self.tried + self.budget
+            if not self._insert(course, self.max_depth, set()):
+                print(f"[Warning] Course {course} could not be placed in any slot.")
+                unplaced.append(course)
+
+        # Bring the score in line with the repair: changed courses re-enter, displaced ones move
+        for course in self.origin:
+            slot = self.schedule.get(course)
+            if slot is None: continue
+            if course not in self.state.assigned:
+                self.state.place(course, slot)
+            elif self.state.assigned[course] != self.slots.day_of(slot):
+                self.state.apply_move(course, slot)
+                self.state.commit()
+
+        # The neighborhood is what the edit touched: the changed courses and any course the repair displaced
+        region = sorted(c for c, slot in self.origin.items()
+                        if c in self.schedule and (c in changed or slot != self.schedule[c]))
+        if optimize: self._optimize(region)
+
+        moved = {c: (slot, self.schedule.get(c)) for c, slot in self.origin.items()
+                 if slot is not None and slot != self.schedule.get(c)}
+        return {'changed': changed, 'placed': [c for c in pending if c in self.schedule], 'unplaced': unplaced,
+                'moved': moved, 'region': len(region), 'score': self.state.score(),
+                'seconds': time.perf_counter() - start}
+
+    def score(self):
+        return self.state.score()
+
+    def daily_load(self):
+        return calculate_daily_load(self.graph, self.schedule, self.slots)
+
+    def decoded_schedule(self):
+        return self.slots.decode_schedule(self.schedule)
+
+    # GRAPH PATCHING: Re-derives one course's node, resource keys and conflict edges from the shared indexes.
+    # Student keys are group keys, one per distinct enrollment list, exactly as create_scheduling_graph makes them.
+    def _rekey(self, course):
+        for key in self.resources.pop(course, ()):
+            self.members[key].discard(course)
+            if not self.members[key]: del self.members[key]
+        if course not in self.courses: return ()
+
+        detail = self.courses[course]
+        keys = [('Lecturer', detail.get('lecturer')), ('Room', detail.get('required_room'))]
+        keys += dict.fromkeys(('Student', frozenset(self.students[sid]))
+                              for sid in sorted(self.enrolled.get(course, ())))
+        self.resources[course] = tuple(keys)
+        for key in keys: self.members.setdefault(key, set()).add(course)
+        return keys
+
+    def _relink(self, course):
+        keys = self._rekey(course)
+        if course not in self.courses:
+            if course in self.graph: self.graph.remove_node(course)
+            self.timeline.spans.pop(course, None)
+            return
+
+        detail = self.courses[course]
+        self.graph.add_node(course,
+                            credits=detail.get('credits', 0),
+                            lecturer=detail.get('lecturer', 'N/A'),
+                            room=detail.get('required_room', 'N/A'),
+                            sem=detail.get('sem', 'N/A'),
+                            span=self.slots.span(detail.get('credits', 0)))
+        self.timeline.spans[course] = self.graph.nodes[course]['span']
+
+        # Any course sharing a key conflicts; former neighbors that share none lose their edge
+        own = set(keys)
+        candidates = set().union(*(self.members[key] for key in keys)) - {course}
+        for other in set(self.graph[course]) - candidates:
+            self.graph.remove_edge(course, other)
+        for other in candidates:
+            shared = {kind for kind, _ in own.intersection(self.resources[other])}
+            self.graph.add_edge(course, other, reason=", ".join(r for r in REASONS if r in shared))
+
+    # LOCAL REPAIR: Same bounded ejection chain as the backtracking scheduler, journaled for undo
+    def _place(self, course, slot):
+        self.origin.setdefault(course, None)
+        self.schedule[course] = slot
+        self.timeline.place(course, slot)
+        self.journal.append((course, None))
+
+    def _evict(self, course):
+        slot = self.schedule.pop(course)
+        self.origin.setdefault(course, slot)
+        self.timeline.remove(course, slot)
+        self.journal.append((course, slot))
+
+    def _undo(self, checkpoint):
+        while len(self.journal) > checkpoint:
+            course, old_slot = self.journal.pop()
+            if old_slot is None:
+                self.timeline.remove(course, self.schedule.pop(course))
+            else:
+                self.schedule[course] = old_slot
+                self.timeline.place(course, old_slot)
+
+    def _insert(self, course, depth, locked):
+        for slot in range(self.slots.slot_count):
+            self.tried += 1
+            if self.timeline.is_free(course, slot):
+                self._place(course, slot)
+                return True
+        if depth == 0: return False
+
+        spans = self.timeline.spans
+        for slot in range(self.slots.slot_count):
+            if self.tried > self.limit: return False
+            if not self.slots.fits(spans[course], slot): continue
+            mask = spans[course] << slot
+            blocking = [n for n in self.graph[course]
+                        if n in self.schedule and (spans[n] << self.schedule[n]) & mask]
+            if len(blocking) > self.max_blockers or locked.intersection(blocking): continue
+
+            checkpoint = len(self.journal)
+            for b in blocking: self._evict(b)
+            self._place(course, slot)
+            locked.add(course)
+            ok = all(self._insert(b, depth - 1, locked) for b in blocking)
+            locked.discard(course)
+            if ok: return True
+            self._undo(checkpoint)
+        return False
+
+    # LOCAL OPTIMIZATION: Best-improvement moves restricted to the touched neighborhood
+    def _optimize(self, region):
+        state = self.state
+        for _ in range(self.rounds):
+            improved = False
+            for course in region:
+                orig_slot = self.schedule[course]
+                self.timeline.remove(course, orig_slot)
+                best = None
+                for slot in range(self.slots.slot_count):
+                    if slot == orig_slot or not self.timeline.is_free(course, slot): continue
+                    delta = state.apply_move(course, slot)
+                    state.rollback()
+                    if delta < 0 and (best is None or delta < best[0]): best = (delta, slot)
+
+                slot = orig_slot
+                if best is not None:
+                    slot = best[1]
+                    self.origin.setdefault(course, orig_slot)
+                    state.apply_move(course, slot)
+                    state.commit()
+                    improved = True
+                self.schedule[course] = slot
+                self.timeline.place(course, slot)
+            if not improved: break
@@ -0,0 +1,106 @@
+import os
+import json
+import glob
+import time
+import pickle
+import hashlib
+import contextlib
+from config import CONFIG
+from graph_core import create_scheduling_graph
+
+# Bump when the compiled graph layout changes so older cache files are never loaded
+CACHE_FORMAT = 2
+# prune_cache keeps the most recently used entries of each kind and drops anything unused for a week
+CACHE_MAX_ENTRIES = 8
+CACHE_MAX_AGE = 7 * 24 * 3600
+
+# CONTENT HASHING: Inputs plus the slot configuration that shapes the precomputed spans
+def _config_fingerprint():
+    return json.dumps({**CONFIG, 'format': CACHE_FORMAT}, sort_keys=True).encode('utf-8')
+
+def instance_hash(courses, students):
+    digest = hashlib.sha256(_config_fingerprint())
+    digest.update(json.dumps(courses, sort_keys=True).encode('utf-8'))
+    digest.update(json.dumps({k: sorted(v) for k, v in students.items()}, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+def file_hash(*filenames):
+    digest = hashlib.sha256(_config_fingerprint())
+    for filename in filenames:
+        with open(filename, 'rb') as f: digest.update(f.read())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+# CACHE STORAGE: One pickle per hash, written atomically. A hit refreshes the file's mtime, which is the
+# recency prune_cache goes by; an entry pruned by another process between lookup and open is just a miss.
+def _read(path):
+    try:
+        with open(path, 'rb') as f: payload = pickle.load(f)
+        with contextlib.suppress(OSError): os.utime(path)
+        return payload
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[Warning] Instance cache unreadable, rebuilding: {e}")
+        return None
+
+def _write(cache_dir, kind, key, payload):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{kind}_{key}.pkl")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f: pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+# CACHE PRUNING: Run once per session, never per write, so entries other runs still use are left alone
+def prune_cache(cache_dir='.cache', max_entries=CACHE_MAX_ENTRIES, max_age=CACHE_MAX_AGE):
+    now, kinds = time.time(), {}
+    for path in glob.glob(os.path.join(cache_dir, '*_*.pkl')):
+        try: kinds.setdefault(os.path.basename(path).split('_', 1)[0], []).append((os.path.getmtime(path), path))
+        except FileNotFoundError: continue
+
+    removed = 0
+    for entries in kinds.values():
+        entries.sort(reverse=True)
+        for rank, (mtime, path) in enumerate(entries):
+            if rank < max_entries and now - mtime <= max_age: continue
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+# COMPILED GRAPH: Adjacency, resource keys and slot spans all live on the pickled graph
+def cached_scheduling_graph(courses, students, cache_dir='.cache'):
+    key = instance_hash(courses, students)
+    graph = _read(os.path.join(cache_dir, f"graph_{key}.pkl"))
+    if graph is not None: return graph
+
+    graph = create_scheduling_graph(courses, students)
+    _write(cache_dir, 'graph', key, graph)
+    return graph
+
+# COMPILED INSTANCE: Hashes the raw JSON bytes, so a cache hit skips JSON parsing as well as the graph build
+def load_compiled_instance(courses_file='courses.json', students_file='students.json', cache_dir='.cache'):
+    key = file_hash(courses_file, students_file)
+    payload = _read(os.path.join(cache_dir, f"instance_{key}.pkl"))
+    if payload is not None: return payload['courses'], payload['students'], payload['graph']
+
+    with open(courses_file, 'r', encoding='utf-8') as f: courses = json.load(f)
+    with open(students_file, 'r', encoding='utf-8') as f: students = {k: set(v) for k, v in json.load(f).items()}
+    graph = create_scheduling_graph(courses, students)
+    _write(cache_dir, 'instance', key, {'courses': courses, 'students': students, 'graph': graph})
+    return courses, students, graph
+
+# COMPILED STORE INSTANCE: Keyed by the store's id and revision; the graph is built from streamed rows
+def load_store_instance(store, cache_dir='.cache'):
+    digest = hashlib.sha256(_config_fingerprint())
+    digest.update(store.fingerprint().encode('utf-8'))
+    key = digest.hexdigest()
+    payload = _read(os.path.join(cache_dir, f"store_{key}.pkl"))
+    if payload is not None: return payload['students'], payload['graph']
+
+    students = {sid: set(codes) for sid, codes in store.iter_enrollments()}
+    graph = create_scheduling_graph(store.course_view(), store.student_view())
+    _write(cache_dir, 'store', key, {'students': students, 'graph': graph})
+    return students, graph
@@ -0,0 +1,42 @@
+import json
+import time
+import contextlib
+
+# PIPELINE INSTRUMENTATION: Phase timers, event counters and optional callback hooks for one run
+class PipelineStats:
+    def __init__(self, hooks=None):
+        self.timers = {}
+        self.counters = {}
+        self.hooks = list(hooks or [])
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timers[name] = self.timers.get(name, 0.0) + elapsed
+            self.emit('phase', name=name, seconds=elapsed)
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    # Hooks receive (event, payload); hot loops only build the payload when a hook is registered
+    def emit(self, event, **payload):
+        for hook in self.hooks:
+            hook(event, payload)
+
+    def as_dict(self):
+        return {'timers': dict(self.timers), 'counters': dict(self.counters)}
+
+    def write_json(self, filename):
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, indent=4)
+
+    def report(self):
+        print("\n[PIPELINE STATS]")
+        for name, seconds in self.timers.items():
+            print(f"{name:20}: {seconds:.4f}s")
+        for name, value in self.counters.items():
+            print(f"{name:20}: {value}")
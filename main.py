@@ -1,20 +1,41 @@
+import io
 import os
+import sys
 import json
+import sqlite3
+import argparse
+import contextlib
 from exporters import export_master_csv, export_individual_schedules, export_lecturer_schedules
 from graph_core import (
     create_scheduling_graph,
-    standard_greedy_coloring,
     equitable_coloring_optimized,
     calculate_daily_load
 )
+from schedulers import INITIAL_SCHEDULERS, run_initial_scheduler
+from multistart import multi_start_optimize
+from decomposition import decomposed_optimize
+from metaheuristics import OPTIMIZER_ENGINES
+from anytime import CancelToken
 from visualization import (
+    RenderQueue,
+    compute_layout,
     visualize_conflict_graph,
     visualize_colored_graph,
+    visualize_aggregated_conflicts,
+    visualize_occupancy_heatmap,
+    GROUP_ATTRIBUTES,
+    LARGE_GRAPH_LIMIT,
     visualize_credits_load,
     visualize_schedule_matrix,
     visualize_student_schedules
 )
-from config import CONFIG
+from config import SLOTS
+from instrumentation import PipelineStats
+from verification import verify_schedule, format_report
+from scoring import ScoreState
+from instance_cache import load_compiled_instance, load_store_instance, prune_cache
+from incremental import IncrementalScheduler
+from store import ScheduleStore, open_store, read_courses_csv
 
 # DATA PERSISTENCE: JSON STORAGE MANAGER
 def manage_json_data(filename, data=None):
@@ -31,11 +52,19 @@ def manage_json_data(filename, data=None):
 # INTERFACE: BULK DATA ENTRY
 def bulk_import_interface():
     print("\n--- BULK IMPORT TOOL ---")
-    print("Format: CODE,LECTURER,CREDITS,ROOM (Type 'DONE' to finish)")
+    print("Format: CODE,LECTURER,CREDITS,ROOM (Type 'FILE <path.csv>' to load a CSV, 'DONE' to finish)")
     new_courses = {}
     while True:
         line = input("> ").strip()
         if not line or line.upper() == 'DONE': break
+        if line.upper().startswith('FILE '):
+            try:
+                loaded = read_courses_csv(line[5:].strip())
+                new_courses.update(loaded)
+                print(f"Loaded {len(loaded)} courses.")
+            except (OSError, KeyError, ValueError) as e:
+                print(f"[Error] CSV import failed: {e}")
+            continue
         try:
             parts = [p.strip() for p in line.split(',')]
             if len(parts) != 4: raise ValueError("Fields mismatch")
@@ -46,83 +75,272 @@ def bulk_import_interface():
     return new_courses
 
 # CORE ENGINE: SCHEDULING WORKFLOW WITH REPORT STATISTICS
-def run_scheduling_process(courses, students):
+ARTIFACTS = ('master_csv', 'student_csv', 'lecturer_csv', 'images')
+
+def run_scheduling_process(courses, students, strategy='auto', engine='hill_climb', starts=1, workers=None,
+                           time_budget=None, seed=0, verbose=True, instrument=None, stats_file=None,
+                           parallel_render=True, layout_cache=None, graph=None, output_dir='output',
+                           artifacts=ARTIFACTS, decompose=False, slots=SLOTS, view='auto', verify=True):
     print("\n" + "="*50 + "\nUNIVERSITY SCHEDULING SYSTEM\n" + "="*50)
-    if not os.path.exists('output'): os.makedirs('output')
+    if not os.path.exists(output_dir): os.makedirs(output_dir)
+    instrument = instrument if instrument is not None else PipelineStats()
+    draw = 'images' in artifacts
+    renders = RenderQueue(parallel=parallel_render and draw)
+    out = lambda name: os.path.join(output_dir, name)
+    result = {'schedule': None, 'artifacts': {}}
 
-    graph = create_scheduling_graph(courses, students)
-    visualize_conflict_graph(graph, 'output/1_conflict_graph.png')
+    # A precompiled graph (e.g. from the instance cache) skips the rebuild
+    with instrument.phase('graph_build'):
+        if graph is None: graph = create_scheduling_graph(courses, students)
+    # Large catalogues get grouped conflict summaries and occupancy heatmaps instead of per-node drawings
+    summary_view = view == 'summary' or (view == 'auto' and len(graph) > LARGE_GRAPH_LIMIT)
+    # Renders are queued on worker processes and only awaited after the export phase
+    if draw:
+        with instrument.phase('render'):
+            if summary_view:
+                for by in GROUP_ATTRIBUTES:
+                    renders.submit(visualize_aggregated_conflicts, graph, out(f'1_conflicts_by_{by}.png'), by)
+            else:
+                pos = compute_layout(graph, layout_cache)
+                renders.submit(visualize_conflict_graph, graph, out('1_conflict_graph.png'), pos)
     
     # PHASE 1: INITIAL GREEDY RESULTS (For Paper Baseline)
-    initial_schedule = standard_greedy_coloring(graph)
+    with instrument.phase('initial_schedule'):
+        initial_schedule, _ = run_initial_scheduler(graph, strategy, instrument, slots)
+    result.update(placed=len(initial_schedule), total=len(graph.nodes))
     if len(initial_schedule) != len(graph.nodes):
         print("[Fatal] Insufficient slots for graph density.")
-        return
+        renders.wait()
+        result['stats'] = instrument.as_dict()
+        return result
 
-    initial_load = calculate_daily_load(graph, initial_schedule)
-    mk_counts = {day: 0 for day in CONFIG['DAYS']}
-    for course, (day, _) in initial_schedule.items(): mk_counts[day] += 1
+    initial_load = calculate_daily_load(graph, initial_schedule, slots)
+    mk_counts = {day: 0 for day in slots.days}
+    for course, slot in initial_schedule.items(): mk_counts[slots.days[slots.day_of(slot)]] += 1
     
     sks_vals = list(initial_load.values())
     print("\n[REPORT DATA: INITIAL GREEDY]")
-    for day in CONFIG['DAYS']:
+    for day in slots.days:
         print(f"{day:10}: {mk_counts[day]:2} MK | Total {initial_load[day]:2} SKS")
     print(f"SKS Max: {max(sks_vals)} | SKS Min: {min(sks_vals)} | Diff: {max(sks_vals)-min(sks_vals)}")
     
-    visualize_credits_load(initial_load, 'output/2a_initial_load.png')
-    visualize_colored_graph(graph, initial_schedule, 'output/3a_colored_initial_schedule.png') 
+    if draw:
+        with instrument.phase('render'):
+            renders.submit(visualize_credits_load, initial_load, out('2a_initial_load.png'), slots)
+            if summary_view:
+                renders.submit(visualize_occupancy_heatmap, graph, slots.decode_schedule(initial_schedule),
+                               out('3a_occupancy_initial.png'), slots)
+            else:
+                renders.submit(visualize_colored_graph, graph, slots.decode_schedule(initial_schedule),
+                               out('3a_colored_initial_schedule.png'), pos)
 
     # PHASE 2: OPTIMIZED RESULTS
-    final_schedule, final_load = equitable_coloring_optimized(graph, initial_schedule, students)
+    with instrument.phase('optimizer'):
+        final_schedule = None
+        if decompose:
+            budget = time_budget if time_budget is not None or engine == 'hill_climb' else 5.0
+            final_schedule, final_load, _ = decomposed_optimize(graph, students, workers, strategy, slots=slots,
+                                                                engine=engine, time_budget=budget, seed=seed)
+        elif starts > 1:
+            final_schedule, final_load, _ = multi_start_optimize(graph, students, starts, workers, time_budget, seed,
+                                                                 slots, strategy, engine)
+        elif engine != 'hill_climb':
+            budget = time_budget if time_budget is not None else 5.0
+            final_schedule, final_load, _ = OPTIMIZER_ENGINES[engine](graph, initial_schedule, students,
+                                                                      time_budget=budget, seed=seed,
+                                                                      instrument=instrument, slots=slots)
+        if final_schedule is None:
+            # The hill climb is anytime: a budget stops it early with the best schedule so far
+            cancel = CancelToken(time_budget) if time_budget is not None else None
+            final_schedule, final_load = equitable_coloring_optimized(graph, initial_schedule, students,
+                                                                      verbose=verbose, instrument=instrument,
+                                                                      slots=slots, cancel=cancel)
+    result.update(slots=final_schedule, initial_load=initial_load, final_load=final_load,
+                  initial_score=ScoreState(graph, initial_schedule, students, slots).score(),
+                  score=ScoreState(graph, final_schedule, students, slots).score())
+    final_schedule = slots.decode_schedule(final_schedule)
+
+    # POST-RUN GATE: An independent sweep-line check; a schedule that fails it is reported, never exported
+    if verify:
+        with instrument.phase('verify'):
+            report = verify_schedule(final_schedule, courses, students, slots)
+        print(format_report(report))
+        result['verification'] = {k: v for k, v in report.items() if k != 'student_metrics'}
+        if not report['ok']:
+            print("[Fatal] Schedule failed verification; no artifacts written.")
+            renders.wait()
+            result['stats'] = instrument.as_dict()
+            return result
+    result['schedule'] = final_schedule
 
     # OUTPUT GENERATION
-    visualize_credits_load(final_load, 'output/2b_final_load.png')
-    visualize_colored_graph(graph, final_schedule, 'output/3b_colored_schedule.png') 
+    if draw:
+        with instrument.phase('render'):
+            renders.submit(visualize_credits_load, final_load, out('2b_final_load.png'), slots)
+            if summary_view:
+                renders.submit(visualize_occupancy_heatmap, graph, final_schedule, out('3b_occupancy_final.png'),
+                               slots)
+            else:
+                renders.submit(visualize_colored_graph, graph, final_schedule, out('3b_colored_schedule.png'), pos)
+        result['artifacts']['images'] = output_dir
     
     # visualize_schedule_matrix(graph, final_schedule) 
     # visualize_student_schedules(students, final_schedule, graph)
     
-    export_master_csv(graph, final_schedule)
-    export_individual_schedules(graph, final_schedule, students)
-    export_lecturer_schedules(graph, final_schedule)
+    with instrument.phase('export'):
+        if 'master_csv' in artifacts:
+            result['artifacts']['master_csv'] = export_master_csv(graph, final_schedule, out('master_schedule.csv'),
+                                                                  slots)
+        if 'student_csv' in artifacts:
+            result['artifacts']['student_csv'] = export_individual_schedules(graph, final_schedule, students,
+                                                                             out('student_schedules'), slots=slots)
+        if 'lecturer_csv' in artifacts:
+            result['artifacts']['lecturer_csv'] = export_lecturer_schedules(graph, final_schedule,
+                                                                            out('lecturer_schedules'), slots=slots)
+    if draw:
+        with instrument.phase('render'):
+            renders.wait()
+
+    if verbose: instrument.report()
+    if stats_file: instrument.write_json(stats_file)
+    result['stats'] = instrument.as_dict()
+    return result
+
+# HEADLESS ENTRY POINT: File inputs in, schedule and metrics out; console output is swallowed unless verbose
+def run_batch(courses_file='courses.json', students_file='students.json', output_dir='output', strategy='auto',
+              engine='hill_climb', starts=1, workers=None, time_budget=None, seed=0, artifacts=ARTIFACTS,
+              cache_dir=None, stats_file=None, verbose=False, decompose=False, db_file=None, view='auto',
+              verify=True):
+    if cache_dir: prune_cache(cache_dir)
+    if db_file:
+        # Opening a missing path would silently create an empty store and schedule nothing
+        if not os.path.exists(db_file): raise FileNotFoundError(f"Store database not found: {db_file}")
+        store = ScheduleStore(db_file)
+        courses = store.course_view()
+        if cache_dir: students, graph = load_store_instance(store, cache_dir)
+        else: students, graph = {sid: set(codes) for sid, codes in store.iter_enrollments()}, None
+    elif cache_dir:
+        courses, students, graph = load_compiled_instance(courses_file, students_file, cache_dir)
+    else:
+        courses = manage_json_data(courses_file)
+        students = {k: set(v) for k, v in manage_json_data(students_file).items()}
+        graph = None
+
+    log = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with log:
+        return run_scheduling_process(courses, students, strategy, engine, starts, workers, time_budget, seed,
+                                      verbose=verbose, stats_file=stats_file, graph=graph,
+                                      output_dir=output_dir, artifacts=artifacts, decompose=decompose, view=view,
+                                      verify=verify)
+
+# LIVE EDITS: After a run, menu edits patch the published schedule in place instead of re-running everything
+def report_live_edit(live, report, output_dir='output'):
+    print(f"[Incremental] {len(report['changed'])} changed | {len(report['moved'])} moved | "
+          f"Score: {report['score']:.2f} | {report['seconds'] * 1000:.1f} ms")
+    if report['unplaced']:
+        print(f"[Warning] {len(report['unplaced'])} course(s) unplaced; run the scheduler (option 5) for a full run.")
+    export_master_csv(live.graph, live.decoded_schedule(), os.path.join(output_dir, 'master_schedule.csv'), live.slots)
 
 # MAIN INTERFACE: TERMINAL MENU
 def main_terminal_interface():
-    courses = manage_json_data('courses.json')
-    students = manage_json_data('students.json')
+    store = open_store()
+    prune_cache()
+    live = None
 
     while True:
-        print(f"\nDB: {len(courses)} Courses | {len(students)} Students")
+        print(f"\nDB: {store.count('courses')} Courses | {store.count('students')} Students")
         print("1. Add Course\n2. Bulk Import\n3. Manage Students\n4. Reset DB\n5. RUN SCHEDULER\n6. Exit")
         choice = input("Option: ")
 
-        if choice == '1':
-            try:
-                code, lec = input("Code: ").upper(), input("Lecturer: ").upper()
-                cred, rm = int(input("Credits: ")), input("Room: ").upper()
-                courses[code] = {'lecturer': lec, 'credits': cred, 'required_room': rm}
-                manage_json_data('courses.json', courses)
-            except ValueError: print("Invalid SKS.")
-        elif choice == '2':
-            courses.update(bulk_import_interface())
-            manage_json_data('courses.json', courses)
-        elif choice == '3':
-            sid = input("Student ID: ").upper()
-            codes = input("Course Codes (comma-separated): ").upper().split(',')
-            valid = [c.strip() for c in codes if c.strip() in courses]
-            students[sid] = list(set(valid))
-            manage_json_data('students.json', students)
-        elif choice == '4':
-            if input("Confirm reset? (y/n): ").lower() == 'y':
-                courses, students = {}, {}
-                for f in ['courses.json', 'students.json']:
-                    if os.path.exists(f): os.remove(f)
-        elif choice == '5':
-            if courses and students:
-                student_sets = {k: set(v) for k, v in students.items()}
-                run_scheduling_process(courses, student_sets)
-            else: print("Database incomplete.")
-        elif choice == '6': break
+        # Another registrar holding the write lock past the busy timeout is reported, not fatal
+        try:
+            if choice == '1':
+                try:
+                    code, lec = input("Code: ").upper(), input("Lecturer: ").upper()
+                    cred, rm = int(input("Credits: ")), input("Room: ").upper()
+                    detail = {'lecturer': lec, 'credits': cred, 'required_room': rm}
+                    store.upsert_course(code, detail)
+                    if live is not None: report_live_edit(live, live.upsert_course(code, detail))
+                except ValueError: print("Invalid SKS.")
+            elif choice == '2':
+                imported = bulk_import_interface()
+                store.upsert_courses(imported)
+                if live is not None and imported: report_live_edit(live, live.update(courses=imported))
+            elif choice == '3':
+                sid = input("Student ID: ").upper()
+                codes = input("Course Codes (comma-separated): ").upper().split(',')
+                valid = list({c.strip() for c in codes if store.course(c.strip()) is not None})
+                store.set_enrollment(sid, valid)
+                if live is not None: report_live_edit(live, live.set_enrollment(sid, valid))
+            elif choice == '4':
+                if input("Confirm reset? (y/n): ").lower() == 'y':
+                    store.reset()
+                    live = None
+            elif choice == '5':
+                if store.count('courses') and store.count('students'):
+                    # Every store write bumps its revision, which keys the compiled-instance cache
+                    student_sets, graph = load_store_instance(store)
+                    result = run_scheduling_process(store.course_view(), student_sets, graph=graph)
+                    live = None
+                    if result['schedule'] is not None:
+                        live = IncrementalScheduler(graph, result['slots'], store.course_view(), student_sets)
+                else: print("Database incomplete.")
+            elif choice == '6': break
+        except sqlite3.OperationalError as e:
+            print(f"[Error] Database unavailable, nothing was changed: {e}")
+    store.close()
+
+# COMMAND LINE: No arguments opens the menu; any flag runs one headless batch
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        main_terminal_interface()
+        return
+
+    parser = argparse.ArgumentParser(description="Headless university scheduling run")
+    parser.add_argument('--batch', action='store_true', help="Run headless with the default inputs")
+    parser.add_argument('--courses', default='courses.json')
+    parser.add_argument('--students', default='students.json')
+    parser.add_argument('--db', default=None, help="Read courses and enrollments from this SQLite store instead")
+    parser.add_argument('--output-dir', default='output')
+    parser.add_argument('--strategy', default='auto', choices=['auto', *INITIAL_SCHEDULERS])
+    parser.add_argument('--engine', default='hill_climb', choices=list(OPTIMIZER_ENGINES))
+    parser.add_argument('--starts', type=int, default=1)
+    parser.add_argument('--decompose', action='store_true', help="Solve conflict-graph components in parallel")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--time-budget', type=float, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--artifacts', default=','.join(ARTIFACTS),
+                        help=f"Comma-separated subset of {', '.join(ARTIFACTS)}, or 'none'")
+    parser.add_argument('--view', default='auto', choices=['auto', 'full', 'summary'],
+                        help=f"Image style; 'auto' switches to summaries above {LARGE_GRAPH_LIMIT} courses")
+    parser.add_argument('--no-verify', action='store_true', help="Skip the post-run schedule verification")
+    parser.add_argument('--cache-dir', default=None, help="Reuse compiled instances from this directory")
+    parser.add_argument('--stats-file', default=None)
+    parser.add_argument('--summary', default=None, help="Write the schedule and metrics as JSON")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    artifacts = [] if args.artifacts == 'none' else [a.strip() for a in args.artifacts.split(',') if a.strip()]
+    unknown = set(artifacts) - set(ARTIFACTS)
+    if unknown: parser.error(f"Unknown artifacts: {', '.join(sorted(unknown))}")
+    if args.db and not os.path.exists(args.db): parser.error(f"Store database not found: {args.db}")
+
+    result = run_batch(args.courses, args.students, args.output_dir, args.strategy, args.engine, args.starts,
+                       args.workers, args.time_budget, args.seed, artifacts, args.cache_dir, args.stats_file,
+                       args.verbose, args.decompose, args.db, args.view, not args.no_verify)
+    if result['schedule'] is None:
+        if not result.get('verification', {}).get('ok', True):
+            print("[Batch] Failed: schedule did not pass verification.")
+        else:
+            print(f"[Batch] Failed: {result['placed']}/{result['total']} courses placed.")
+        sys.exit(1)
+    print(f"[Batch] {result['total']} courses scheduled | Score: {result['initial_score']:.2f} -> "
+          f"{result['score']:.2f}")
+    if args.summary:
+        summary = {k: v for k, v in result.items() if k != 'slots'}
+        manage_json_data(args.summary, summary)
+        print(f"[Batch] Summary written to: {args.summary}")
 
 if __name__ == '__main__':
-    main_terminal_interface()
\ No newline at end of file
+    main()
\ No newline at end of file
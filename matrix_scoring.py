@@ -0,0 +1,85 @@
+import numpy as np
+from config import SLOTS
+
+# VECTORIZED OBJECTIVE: Sparse student x course enrollments scored against a course -> day vector
+class MatrixScorer:
+    def __init__(self, graph, student_data=None, slots=SLOTS):
+        self.slots = slots
+        self.courses = list(graph.nodes)
+        self.position = {c: i for i, c in enumerate(self.courses)}
+        self.days = len(slots.days)
+        self.weight = slots.weight
+        self.credits = np.array([graph.nodes[c].get('credits', 0) for c in self.courses], dtype=np.int64)
+
+        # COO enrollment entries; a repeated code becomes a multiplicity, as it counts twice in the reference loop
+        entries = {}
+        self.students = list((student_data or {}).keys())
+        for s_idx, sid in enumerate(self.students):
+            for c in student_data[sid]:
+                if c in self.position:
+                    key = (s_idx, self.position[c])
+                    entries[key] = entries.get(key, 0) + 1
+        self.enroll_student = np.array([s for s, _ in entries], dtype=np.int64)
+        self.enroll_course = np.array([c for _, c in entries], dtype=np.int64)
+        self.enroll_credits = self.credits[self.enroll_course] * np.array(list(entries.values()), dtype=np.int64)
+
+        # Course-major (CSR) view of the same entries for per-move student lookups
+        order = np.argsort(self.enroll_course, kind='stable')
+        self.by_course_student = self.enroll_student[order]
+        self.by_course_credits = self.enroll_credits[order]
+        self.course_ptr = np.zeros(len(self.courses) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.enroll_course, minlength=len(self.courses)), out=self.course_ptr[1:])
+
+    def assignment(self, schedule):
+        assign = np.full(len(self.courses), -1, dtype=np.int64)
+        for course, slot in schedule.items():
+            assign[self.position[course]] = self.slots.day_of(slot)
+        return assign
+
+    # Unscheduled courses (day -1) carry no load, matching the `c in result` guard of the reference
+    def daily_load(self, assign):
+        placed = assign >= 0
+        return np.bincount(assign[placed], weights=self.credits[placed], minlength=self.days).astype(np.int64)
+
+    def student_loads(self, assign):
+        day = assign[self.enroll_course]
+        placed = day >= 0
+        cells = self.enroll_student[placed] * self.days + day[placed]
+        loads = np.bincount(cells, weights=self.enroll_credits[placed],
+                            minlength=len(self.students) * self.days)
+        return loads.astype(np.int64).reshape(len(self.students), self.days)
+
+    def student_variance(self, assign):
+        loads = self.student_loads(assign)
+        return float(((loads - loads.mean(axis=1, keepdims=True)) ** 2).sum())
+
+    def score(self, assign):
+        load = self.daily_load(assign)
+        glob_var = float((load * load).sum()) - float(load.sum()) ** 2 / self.days
+        loads = self.student_loads(assign)
+        stud_var = float((loads * loads).sum()) - float((loads.sum(axis=1) ** 2).sum()) / self.days
+        return glob_var + (self.weight * stud_var)
+
+    # BATCH MOVE SCORING: Score deltas for many (course, new day) candidates of scheduled courses at once
+    def move_deltas(self, assign, courses, new_days, load=None, loads=None):
+        courses = np.asarray(courses, dtype=np.int64)
+        new_days = np.asarray(new_days, dtype=np.int64)
+        load = self.daily_load(assign) if load is None else load
+        loads = self.student_loads(assign) if loads is None else loads
+
+        cr = self.credits[courses]
+        old_days = assign[courses]
+        d_glob = 2 * cr * (load[new_days] - load[old_days] + cr)
+
+        # Expand every candidate into its course's enrollment entries, then reduce back per candidate
+        counts = self.course_ptr[courses + 1] - self.course_ptr[courses]
+        owner = np.repeat(np.arange(len(courses)), counts)
+        starts = np.repeat(self.course_ptr[courses] - np.cumsum(counts) + counts, counts)
+        picked = np.arange(counts.sum()) + starts
+        entries, w = self.by_course_student[picked], self.by_course_credits[picked]
+        term = 2 * w * (loads[entries, new_days[owner]] - loads[entries, old_days[owner]] + w)
+        d_stud = np.bincount(owner, weights=term, minlength=len(courses))
+
+        d_glob = np.where(old_days == new_days, 0, d_glob)
+        d_stud = np.where(old_days == new_days, 0, d_stud)
+        return d_glob + (self.weight * d_stud)
@@ -0,0 +1,280 @@
+import math
+import random
+import time
+from config import SLOTS
+from graph_core import equitable_coloring_optimized, calculate_daily_load
+from occupancy import OccupancyTimeline
+from scoring import ScoreState
+from exact_solver import exact_optimize
+from anytime import CancelToken
+
+# SEARCH STATE: Applies sampled moves and swaps under the is_safe_to_place rules with O(affected) undo
+class SearchState:
+    def __init__(self, graph, schedule, student_data=None, slots=SLOTS):
+        self.slots = slots
+        self.current = dict(schedule)
+        self.scores = ScoreState(graph, self.current, student_data, slots)
+        self.timeline = OccupancyTimeline(graph, self.current, slots)
+        self.pending = []
+
+    def try_move(self, course, slot):
+        old = self.current[course]
+        if slot == old: return None
+        self.timeline.remove(course, old)
+        if not self.timeline.is_free(course, slot):
+            self.timeline.place(course, old)
+            return None
+        self.timeline.place(course, slot)
+        self.pending = [(course, old, slot)]
+        return self.scores.apply_move(course, slot)
+
+    def try_swap(self, c1, c2):
+        slot1, slot2 = self.current[c1], self.current[c2]
+        if self.slots.day_of(slot1) == self.slots.day_of(slot2): return None
+        self.timeline.remove(c1, slot1)
+        self.timeline.remove(c2, slot2)
+        if self.timeline.is_free(c1, slot2):
+            self.timeline.place(c1, slot2)
+            if self.timeline.is_free(c2, slot1):
+                self.timeline.place(c2, slot1)
+                self.pending = [(c1, slot1, slot2), (c2, slot2, slot1)]
+                return self.scores.apply_swap(c1, c2)
+            self.timeline.remove(c1, slot2)
+        self.timeline.place(c1, slot1)
+        self.timeline.place(c2, slot2)
+        return None
+
+    def accept(self):
+        for course, _, new in self.pending: self.current[course] = new
+        self.scores.commit()
+        self.pending = []
+
+    # Clear every new placement before restoring the old ones so shared resource bits stay intact
+    def reject(self):
+        for course, _, new in self.pending: self.timeline.remove(course, new)
+        for course, old, _ in self.pending: self.timeline.place(course, old)
+        self.scores.rollback()
+        self.pending = []
+
+def _sample(state, nodes, rng, swap_rate):
+    if rng.random() < swap_rate:
+        c1, c2 = rng.sample(nodes, 2)
+        return ('swap', c1, c2), state.try_swap(c1, c2)
+    course, slot = rng.choice(nodes), rng.randrange(state.slots.slot_count)
+    return ('move', course, slot), state.try_move(course, slot)
+
+def _record(instrument, evaluations, accepted):
+    if instrument is None: return
+    instrument.count('score_evaluations', evaluations)
+    instrument.count('accepted_moves', accepted['move'])
+    instrument.count('accepted_swaps', accepted['swap'])
+
+def _budget_left(started, evaluations, time_budget, max_evaluations):
+    if max_evaluations is not None and evaluations >= max_evaluations: return False
+    return time_budget is None or time.perf_counter() - started < time_budget
+
+# SIMULATED ANNEALING: Samples moves and swaps, accepting uphill steps with probability exp(-delta / T)
+def simulated_annealing(graph, initial_coloring, student_data=None, time_budget=5.0, max_evaluations=None,
+                        seed=0, start_temp=None, cooling=0.9995, swap_rate=0.3, instrument=None,
+                        slots=SLOTS):
+    if time_budget is None and max_evaluations is None:
+        raise ValueError("Simulated annealing needs a time_budget or max_evaluations.")
+    rng = random.Random(seed)
+    state = SearchState(graph, initial_coloring, student_data, slots)
+    nodes = list(graph.nodes)
+    started, evaluations = time.perf_counter(), 0
+
+    score = best_score = state.scores.score()
+    best = dict(state.current)
+    trace = [{'elapsed': 0.0, 'evaluations': 0, 'score': score}]
+    accepted = {'move': 0, 'swap': 0}
+
+    # Calibrate T0 so a typical uphill step starts out accepted about half the time
+    if start_temp is None:
+        uphill = []
+        for _ in range(200):
+            _, delta = _sample(state, nodes, rng, swap_rate)
+            if delta is None: continue
+            if delta > 0: uphill.append(delta)
+            state.reject()
+        start_temp = (sum(uphill) / len(uphill)) / math.log(2) if uphill else 1.0
+    temp = start_temp
+
+    while len(nodes) > 1 and _budget_left(started, evaluations, time_budget, max_evaluations):
+        move, delta = _sample(state, nodes, rng, swap_rate)
+        evaluations += 1
+        if delta is None: continue
+        temp = max(temp * cooling, 1e-9)
+
+        if delta < 0 or rng.random() < math.exp(-delta / temp):
+            state.accept()
+            accepted[move[0]] += 1
+            score = state.scores.score()
+            if score < best_score - 1e-9:
+                best_score, best = score, dict(state.current)
+                trace.append({'elapsed': time.perf_counter() - started, 'evaluations': evaluations, 'score': best_score})
+        else:
+            state.reject()
+
+    trace.append({'elapsed': time.perf_counter() - started, 'evaluations': evaluations, 'score': best_score})
+    _record(instrument, evaluations, accepted)
+    print(f"[ANNEALING DONE] Evaluations: {evaluations} | Best Score: {best_score:.2f}")
+    return best, calculate_daily_load(graph, best, slots), trace
+
+# TABU SEARCH: Takes the best of a sampled candidate list each step, forbidding recently moved courses
+def tabu_search(graph, initial_coloring, student_data=None, time_budget=5.0, max_evaluations=None,
+                seed=0, candidates=40, tenure=7, swap_rate=0.3, instrument=None, slots=SLOTS):
+    if time_budget is None and max_evaluations is None:
+        raise ValueError("Tabu search needs a time_budget or max_evaluations.")
+    rng = random.Random(seed)
+    state = SearchState(graph, initial_coloring, student_data, slots)
+    nodes = list(graph.nodes)
+    started, evaluations, step = time.perf_counter(), 0, 0
+    tabu_until, accepted = {}, {'move': 0, 'swap': 0}
+
+    score = best_score = state.scores.score()
+    best = dict(state.current)
+    trace = [{'elapsed': 0.0, 'evaluations': 0, 'score': score}]
+
+    while len(nodes) > 1 and _budget_left(started, evaluations, time_budget, max_evaluations):
+        step += 1
+        chosen = None
+        for _ in range(candidates):
+            move, delta = _sample(state, nodes, rng, swap_rate)
+            evaluations += 1
+            if delta is None: continue
+            state.reject()
+
+            # Aspiration: a tabu course may still move if it beats the best schedule seen so far
+            moved = move[1:3] if move[0] == 'swap' else move[1:2]
+            is_tabu = any(tabu_until.get(c, 0) > step for c in moved)
+            if is_tabu and score + delta >= best_score - 1e-9: continue
+            if chosen is None or delta < chosen[1]: chosen = (move, delta)
+
+        if chosen is None: continue
+        (kind, a, b), delta = chosen
+        if kind == 'move': state.try_move(a, b)
+        else: state.try_swap(a, b)
+        state.accept()
+        accepted[kind] += 1
+        score = state.scores.score()
+        tabu_until[a] = step + tenure
+        if kind == 'swap': tabu_until[b] = step + tenure
+
+        if score < best_score - 1e-9:
+            best_score, best = score, dict(state.current)
+            trace.append({'elapsed': time.perf_counter() - started, 'evaluations': evaluations, 'score': best_score})
+
+    trace.append({'elapsed': time.perf_counter() - started, 'evaluations': evaluations, 'score': best_score})
+    _record(instrument, evaluations, accepted)
+    print(f"[TABU DONE] Steps: {step} | Evaluations: {evaluations} | Best Score: {best_score:.2f}")
+    return best, calculate_daily_load(graph, best, slots), trace
+
+# CANDIDATE LISTS: Ranks courses by how much they feed overloaded days and high-variance students
+def rank_candidates(scores, nodes):
+    k = len(scores.days)
+    day_mean = scores.glob_total / k
+    student_mean = {sid: sum(load) / k for sid, load in scores.student_load.items()}
+    rank = {}
+    for c in nodes:
+        day, cr = scores.assigned[c], scores.credits[c]
+        stud = sum(scores.student_load[sid][day] - student_mean[sid] for sid in scores.course_students[c])
+        rank[c] = cr * ((scores.day_load[day] - day_mean) + scores.weight * stud)
+    return sorted(nodes, key=rank.get, reverse=True)
+
+def _scan(graph, state, movers, partners, selection):
+    timeline, scores, current, slots = state.timeline, state.scores, state.current, state.slots
+    chosen, evaluations = None, 0
+
+    def consider(move, delta):
+        nonlocal chosen
+        if delta < 0 and (chosen is None or delta < chosen[1]): chosen = (move, delta)
+        return chosen is not None and selection == 'first'
+
+    # Each mover is lifted off its timelines once; same-day targets never change the objective
+    for course in movers:
+        orig_slot = current[course]
+        orig_day = slots.day_of(orig_slot)
+        timeline.remove(course, orig_slot)
+        for slot in range(slots.slot_count):
+            if slots.day_of(slot) == orig_day or not timeline.is_free(course, slot): continue
+            evaluations += 1
+            delta = scores.apply_move(course, slot)
+            scores.rollback()
+            if consider(('move', course, slot), delta): break
+        timeline.place(course, orig_slot)
+        if chosen is not None and selection == 'first': return chosen, evaluations
+
+    # Courses on different days that share no resource cannot block each other, so their swap is
+    # checked against the live timelines; neighbors go through the full remove/re-place test
+    for c1 in movers:
+        adjacent = graph[c1]
+        for c2 in partners:
+            slot1, slot2 = current[c1], current[c2]
+            if c1 == c2 or slots.day_of(slot1) == slots.day_of(slot2): continue
+            if c2 in adjacent:
+                delta = state.try_swap(c1, c2)
+                if delta is None: continue
+                state.reject()
+            elif timeline.is_free(c1, slot2) and timeline.is_free(c2, slot1):
+                delta = scores.apply_swap(c1, c2)
+                scores.rollback()
+            else: continue
+            evaluations += 1
+            if consider(('swap', c1, c2), delta): return chosen, evaluations
+    return chosen, evaluations
+
+# NEIGHBORHOOD SEARCH: Moves for the heaviest courses and swaps of heavy against light ones, scored in place.
+# The lists double whenever they hold no improving step, so the search still ends in a true local optimum.
+def neighborhood_search(graph, initial_coloring, student_data=None, time_budget=5.0, max_evaluations=None,
+                        seed=0, selection='best', candidates=40, instrument=None, slots=SLOTS):
+    if selection not in ('best', 'first'):
+        raise ValueError(f"Unknown selection rule: {selection}")
+    state = SearchState(graph, initial_coloring, student_data, slots)
+    nodes = list(graph.nodes)
+    started, evaluations, limit = time.perf_counter(), 0, candidates
+    accepted = {'move': 0, 'swap': 0}
+
+    score = state.scores.score()
+    trace = [{'elapsed': 0.0, 'evaluations': 0, 'score': score}]
+
+    while len(nodes) > 1 and _budget_left(started, evaluations, time_budget, max_evaluations):
+        ranked = rank_candidates(state.scores, nodes)
+        chosen, spent = _scan(graph, state, ranked[:limit], ranked[-limit:], selection)
+        evaluations += spent
+        if chosen is None:
+            if limit >= len(nodes): break
+            limit *= 2
+            continue
+
+        (kind, a, b), _ = chosen
+        if kind == 'move': state.try_move(a, b)
+        else: state.try_swap(a, b)
+        state.accept()
+        accepted[kind] += 1
+        score = state.scores.score()
+        limit = candidates
+        trace.append({'elapsed': time.perf_counter() - started, 'evaluations': evaluations, 'score': score})
+
+    trace.append({'elapsed': time.perf_counter() - started, 'evaluations': evaluations, 'score': score})
+    _record(instrument, evaluations, accepted)
+    print(f"[NEIGHBORHOOD DONE] Moves: {accepted['move']} | Swaps: {accepted['swap']} | "
+          f"Evaluations: {evaluations} | Score: {score:.2f}")
+    return dict(state.current), calculate_daily_load(graph, state.current, slots), trace
+
+# ENGINE REGISTRY: Uniform (graph, initial, students, budget, evaluations, seed) -> (schedule, load, trace)
+def _hill_climb(graph, initial_coloring, student_data=None, time_budget=None, max_evaluations=None, seed=0,
+                verbose=True, instrument=None, slots=SLOTS):
+    trace = []
+    cancel = CancelToken(time_budget) if time_budget is not None else None
+    schedule, load = equitable_coloring_optimized(graph, initial_coloring, student_data, trace=trace,
+                                                  verbose=verbose, instrument=instrument, slots=slots, cancel=cancel)
+    return schedule, load, trace
+
+OPTIMIZER_ENGINES = {
+    'hill_climb': _hill_climb,
+    'annealing': simulated_annealing,
+    'tabu': tabu_search,
+    'neighborhood': neighborhood_search,
+    'exact': exact_optimize,
+}
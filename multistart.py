@@ -0,0 +1,91 @@
+import io
+import os
+import random
+import time
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from config import SLOTS
+from graph_core import calculate_daily_load
+from metaheuristics import OPTIMIZER_ENGINES
+from schedulers import run_initial_scheduler
+from occupancy import OccupancyTimeline
+from scoring import ScoreState
+
+# RANDOMIZED SEEDING: Degree-first greedy with shuffled ties and a rotated day order per seed
+def randomized_greedy_coloring(graph, rng, slots=SLOTS):
+    jitter = {c: rng.random() for c in graph.nodes}
+    nodes_sorted = sorted(graph.nodes(), key=lambda n: (graph.degree[n], jitter[n]), reverse=True)
+    day_order = list(range(len(slots.days)))
+    rng.shuffle(day_order)
+    slot_order = [d * slots.slots_per_day + i for d in day_order for i in range(slots.slots_per_day)]
+
+    timeline = OccupancyTimeline(graph, slots=slots)
+    result = {}
+    for course in nodes_sorted:
+        for slot in slot_order:
+            if timeline.is_free(course, slot):
+                result[course] = slot
+                timeline.place(course, slot)
+                break
+    return result
+
+# WORKER STATE: The graph and enrollments are shipped once per process through the pool initializer
+_WORKER = {}
+
+def _init_worker(graph, student_data, slots):
+    _WORKER['graph'] = graph
+    _WORKER['students'] = student_data
+    _WORKER['slots'] = slots
+
+def _run_start(index, seed, deadline, strategy='auto', engine='hill_climb'):
+    if deadline is not None and time.time() >= deadline:
+        return index, seed, None, None
+    graph, students, slots = _WORKER['graph'], _WORKER['students'], _WORKER['slots']
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Start 0 keeps the caller's deterministic baseline so multi-start never does worse than a single run
+        initial = (run_initial_scheduler(graph, strategy, slots=slots)[0] if index == 0
+                   else randomized_greedy_coloring(graph, random.Random(seed), slots))
+        if len(initial) != len(graph.nodes):
+            return index, seed, None, None
+
+        # The engine stops itself at the shared deadline and returns its best schedule so far
+        options = {'seed': seed, 'slots': slots}
+        if deadline is not None: options['time_budget'] = max(0.0, deadline - time.time())
+        schedule, _, _ = OPTIMIZER_ENGINES[engine](graph, initial, students, **options)
+    return index, seed, schedule, ScoreState(graph, schedule, students, slots).score()
+
+# MULTI-START OPTIMIZATION: Fans seeded greedy + optimizer runs over a process pool and keeps the best.
+# Without a time budget each start runs the engine under its own default budget.
+def multi_start_optimize(graph, student_data, starts=8, workers=None, time_budget=None, seed=0, slots=SLOTS,
+                         strategy='auto', engine='hill_climb'):
+    if engine not in OPTIMIZER_ENGINES: raise ValueError(f"Unknown optimizer engine: {engine}")
+    rng = random.Random(seed)
+    seeds = [rng.getrandbits(32) for _ in range(starts)]
+    deadline = time.time() + time_budget if time_budget is not None else None
+    workers = min(workers or os.cpu_count() or 1, starts)
+
+    scores, best = {}, None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(graph, student_data, slots)) as pool:
+        # Every start honours the deadline itself (queued ones return at once), so all results are kept
+        pending = {pool.submit(_run_start, i, s, deadline, strategy, engine) for i, s in enumerate(seeds)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, run_seed, schedule, score = future.result()
+                if schedule is None: continue
+                scores[index] = score
+                # Ties go to the lowest start index so the winner does not depend on completion order
+                if best is None or (score, index) < (best[0], best[1]):
+                    best = (score, index, run_seed, schedule)
+
+    if best is None:
+        print("[Warning] No multi-start run produced a complete schedule.")
+        return None, None, {'starts': starts, 'completed': 0, 'scores': scores}
+
+    score, index, run_seed, schedule = best
+    print(f"[Multi-Start] {len(scores)}/{starts} runs completed | Best start #{index} (seed {run_seed}) | Score: {score:.2f}")
+    report = {'starts': starts, 'completed': len(scores), 'best_start': index,
+              'best_seed': run_seed, 'best_score': score, 'scores': scores}
+    return schedule, calculate_daily_load(graph, schedule, slots), report
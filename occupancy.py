@@ -0,0 +1,59 @@
+from config import SLOTS
+
+# RESOURCE KEYS: Lecturer, room and student-group tags per course, falling back to one key per conflict edge
+def course_resources(graph):
+    if 'resources' in graph.graph:
+        return graph.graph['resources']
+    resources = {c: [] for c in graph.nodes}
+    for u, v in graph.edges:
+        key = ('Edge', frozenset((u, v)))
+        resources[u].append(key)
+        resources[v].append(key)
+    return {c: tuple(keys) for c, keys in resources.items()}
+
+# OCCUPANCY TIMELINES: One week-wide busy mask per resource, kept live across place, move and swap.
+# A course holding more keys than it has neighbors is checked against its placed neighbors instead.
+class OccupancyTimeline:
+    def __init__(self, graph, schedule=None, slots=SLOTS):
+        self.slots = slots
+        self.resources = course_resources(graph)
+        self.adj = graph.adj
+        self.spans = {c: graph.nodes[c]['span'] for c in graph.nodes}
+        self.busy, self.placed = {}, {}
+        for course, slot in (schedule or {}).items():
+            self.place(course, slot)
+
+    # Same answer as is_safe_to_place, reading whichever is shorter: the course's keys or its neighbors
+    def is_free(self, course, slot):
+        span = self.spans[course]
+        if not self.slots.fits(span, slot):
+            return False
+        mask = span << slot
+        keys, neighbors = self.resources[course], self.adj[course]
+        if len(keys) > len(neighbors):
+            placed, spans = self.placed, self.spans
+            for n in neighbors:
+                n_slot = placed.get(n)
+                if n_slot is not None and (spans[n] << n_slot) & mask:
+                    return False
+            return True
+        busy = self.busy
+        for key in keys:
+            if busy.get(key, 0) & mask:
+                return False
+        return True
+
+    def place(self, course, slot):
+        mask = self.spans[course] << slot
+        busy = self.busy
+        for key in self.resources[course]:
+            busy[key] = busy.get(key, 0) | mask
+        self.placed[course] = slot
+
+    # Clearing bits assumes a conflict-free schedule, which every caller maintains
+    def remove(self, course, slot):
+        mask = ~(self.spans[course] << slot)
+        busy = self.busy
+        for key in self.resources[course]:
+            busy[key] &= mask
+        self.placed.pop(course, None)
@@ -0,0 +1,117 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from config import SLOTS
+from graph_core import create_scheduling_graph, calculate_student_load_variance
+from schedulers import run_initial_scheduler
+from metaheuristics import OPTIMIZER_ENGINES
+from scoring import ScoreState
+
+# SCENARIO GRID: Every combination of the listed CONFIG overrides, e.g. {'STUDENT_WEIGHT': [0.25, 0.5]}
+def expand_grid(grid):
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+# WORKER STATE: The compiled graph is config-independent, so one copy per process serves every scenario
+_WORKER = {}
+
+def _init_worker(graph, student_data):
+    _WORKER['graph'] = graph
+    _WORKER['students'] = student_data
+
+def _run_scenario(index, overrides, strategy, engine, time_budget, seed):
+    graph, students = _WORKER['graph'], _WORKER['students']
+    slots = SLOTS.with_overrides(**overrides)
+    started = time.perf_counter()
+    row = {'scenario': index, **overrides, 'placed': 0, 'total': len(graph.nodes)}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        initial, _ = run_initial_scheduler(graph, strategy, slots=slots)
+        row['placed'] = len(initial)
+        if len(initial) == len(graph.nodes):
+            budget = time_budget if time_budget is not None or engine == 'hill_climb' else 5.0
+            schedule, load, _ = OPTIMIZER_ENGINES[engine](graph, initial, students, time_budget=budget, seed=seed,
+                                                          slots=slots)
+            loads = list(load.values())
+            mean = sum(loads) / len(loads)
+            row.update(score=ScoreState(graph, schedule, students, slots).score(),
+                       load_spread=max(loads) - min(loads),
+                       global_variance=sum((x - mean) ** 2 for x in loads),
+                       student_variance=calculate_student_load_variance(students, schedule, graph, slots))
+    row['seconds'] = time.perf_counter() - started
+    return row
+
+# SCENARIO RUNNER: Evaluates the grid concurrently on worker processes against one compiled graph
+def run_scenarios(graph, student_data, grid, strategy='auto', engine='hill_climb', time_budget=None, seed=0,
+                  workers=None):
+    scenarios = expand_grid(grid) if isinstance(grid, dict) else list(grid)
+    if not scenarios: return []
+    workers = min(workers or os.cpu_count() or 1, len(scenarios))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(graph, student_data)) as pool:
+        jobs = [pool.submit(_run_scenario, i, overrides, strategy, engine, time_budget, seed)
+                for i, overrides in enumerate(scenarios)]
+        return [job.result() for job in jobs]
+
+def format_table(rows):
+    if not rows: return "(no scenarios)"
+    metrics = ['placed', 'score', 'load_spread', 'global_variance', 'student_variance', 'seconds']
+    params = [k for k in rows[0] if k not in metrics and k not in ('scenario', 'total')]
+
+    def cell(row, key):
+        value = row.get(key, '-')
+        if key == 'placed': return f"{value}/{row['total']}"
+        if key == 'DAYS': return f"{len(value)} days"
+        if isinstance(value, float): return f"{value:.2f}"
+        return str(value)
+
+    header = ['#', *params, *metrics]
+    table = [[str(r['scenario']), *(cell(r, k) for k in params), *(cell(r, k) for k in metrics)] for r in rows]
+    widths = [max(len(h), *(len(line[i]) for line in table)) for i, h in enumerate(header)]
+    lines = [" | ".join(h.ljust(w) for h, w in zip(header, widths)), "-+-".join("-" * w for w in widths)]
+    lines += [" | ".join(v.ljust(w) for v, w in zip(line, widths)) for line in table]
+    return "\n".join(lines)
+
+# COMMAND LINE: Comma-separated values per setting; day sets are separated by ';'
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate a grid of scheduling configurations")
+    parser.add_argument('--courses', default='courses.json')
+    parser.add_argument('--students', default='students.json')
+    parser.add_argument('--weights', default=None, help="STUDENT_WEIGHT values, e.g. 0.25,0.5,1")
+    parser.add_argument('--slot-durations', default=None, help="SLOT_DURATION minutes, e.g. 50,60")
+    parser.add_argument('--end-limits', default=None, help="END_LIMIT times, e.g. 16:40,18:00")
+    parser.add_argument('--days', default=None, help="Day sets, e.g. 'Monday,Tuesday;Monday,Tuesday,Wednesday'")
+    parser.add_argument('--strategy', default='auto')
+    parser.add_argument('--engine', default='hill_climb', choices=list(OPTIMIZER_ENGINES))
+    parser.add_argument('--time-budget', type=float, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default=None, help="Write the comparison rows as JSON")
+    args = parser.parse_args(argv)
+
+    grid = {}
+    if args.weights: grid['STUDENT_WEIGHT'] = [float(v) for v in args.weights.split(',')]
+    if args.slot_durations: grid['SLOT_DURATION'] = [int(v) for v in args.slot_durations.split(',')]
+    if args.end_limits: grid['END_LIMIT'] = [v.strip() for v in args.end_limits.split(',')]
+    if args.days: grid['DAYS'] = [[d.strip() for d in group.split(',')] for group in args.days.split(';')]
+    if not grid: parser.error("Give at least one of --weights, --slot-durations, --end-limits, --days")
+
+    with open(args.courses, 'r', encoding='utf-8') as f: courses = json.load(f)
+    with open(args.students, 'r', encoding='utf-8') as f: students = {k: set(v) for k, v in json.load(f).items()}
+    graph = create_scheduling_graph(courses, students)
+
+    rows = run_scenarios(graph, students, grid, args.strategy, args.engine, args.time_budget, args.seed,
+                         args.workers)
+    print(format_table(rows))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f: json.dump(rows, f, indent=4)
+        print(f"\nScenario results saved to: {args.output}")
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,144 @@
+import heapq
+import time
+from config import SLOTS
+from graph_core import standard_greedy_coloring
+from occupancy import OccupancyTimeline
+
+# GREEDY STRATEGY: The highest-degree-first baseline; each placed course scanned slots up to its own
+def greedy_scheduler(graph, slots=SLOTS):
+    result = standard_greedy_coloring(graph, slots=slots)
+    tried = sum(slot + 1 for slot in result.values()) + (len(graph.nodes) - len(result)) * slots.slot_count
+    return result, tried
+
+# DSATUR STRATEGY: Always places the course with the fewest feasible (day, start) slots left
+def dsatur_scheduler(graph, slots=SLOTS):
+    timeline = OccupancyTimeline(graph, slots=slots)
+    result = {}
+    tried = 0
+
+    def feasible_count(course):
+        nonlocal tried
+        tried += slots.slot_count
+        return sum(1 for slot in range(slots.slot_count) if timeline.is_free(course, slot))
+
+    order = {c: i for i, c in enumerate(graph.nodes)}
+    saturation = {c: feasible_count(c) for c in graph.nodes}
+    heap = [(saturation[c], -graph.degree[c], order[c], c) for c in graph.nodes]
+    heapq.heapify(heap)
+
+    # Stale heap entries are skipped lazily instead of re-keyed in place
+    while heap:
+        count, _, _, course = heapq.heappop(heap)
+        if course in result or count != saturation[course]: continue
+
+        for slot in range(slots.slot_count):
+            tried += 1
+            if timeline.is_free(course, slot):
+                result[course] = slot
+                timeline.place(course, slot)
+                break
+        else:
+            print(f"[Warning] Course {course} could not be placed in any slot.")
+            saturation[course] = -1
+            continue
+
+        for neighbor in graph[course]:
+            if neighbor not in result and saturation[neighbor] >= 0:
+                saturation[neighbor] = feasible_count(neighbor)
+                heapq.heappush(heap, (saturation[neighbor], -graph.degree[neighbor], order[neighbor], neighbor))
+    return result, tried
+
+# BACKTRACKING STRATEGY: Welsh-Powell order with a bounded ejection-chain repair for stuck courses
+def backtracking_scheduler(graph, max_depth=3, max_blockers=2, budget=20000, slots=SLOTS):
+    timeline = OccupancyTimeline(graph, slots=slots)
+    spans = timeline.spans
+    result, journal, locked = {}, [], set()
+    tried = limit = 0
+
+    def place(course, slot):
+        result[course] = slot
+        timeline.place(course, slot)
+        journal.append((course, None))
+
+    def evict(course):
+        slot = result.pop(course)
+        timeline.remove(course, slot)
+        journal.append((course, slot))
+
+    def undo(checkpoint):
+        while len(journal) > checkpoint:
+            course, old_slot = journal.pop()
+            if old_slot is None:
+                timeline.remove(course, result.pop(course))
+            else:
+                result[course] = old_slot
+                timeline.place(course, old_slot)
+
+    def blockers(course, slot):
+        mask = spans[course] << slot
+        return [n for n in graph[course] if n in result and (spans[n] << result[n]) & mask]
+
+    def insert(course, depth):
+        nonlocal tried
+        for slot in range(slots.slot_count):
+            tried += 1
+            if timeline.is_free(course, slot):
+                place(course, slot)
+                return True
+
+        # No free slot: evict a few blockers, take their place and re-insert them one level deeper
+        if depth == 0: return False
+        for slot in range(slots.slot_count):
+            if tried > limit: return False
+            if not slots.fits(spans[course], slot): continue
+            blocking = blockers(course, slot)
+            if len(blocking) > max_blockers or locked.intersection(blocking): continue
+
+            checkpoint = len(journal)
+            for b in blocking: evict(b)
+            place(course, slot)
+            locked.add(course)
+            ok = all(insert(b, depth - 1) for b in blocking)
+            locked.discard(course)
+            if ok: return True
+            undo(checkpoint)
+        return False
+
+    # The repair budget is per course so one hopeless course cannot starve the rest
+    nodes_sorted = sorted(graph.nodes(), key=lambda n: graph.degree[n], reverse=True)
+    for course in nodes_sorted:
+        limit = tried + budget
+        if not insert(course, max_depth):
+            print(f"[Warning] Course {course} could not be placed in any slot.")
+    return result, tried
+
+# STRATEGY REGISTRY: Every initial scheduler takes the graph and returns (schedule, placements tried)
+INITIAL_SCHEDULERS = {
+    'greedy': greedy_scheduler,
+    'dsatur': dsatur_scheduler,
+    'backtracking': backtracking_scheduler,
+}
+AUTO_ORDER = ('greedy', 'backtracking', 'dsatur')
+
+# STRATEGY RUNNER: Times one strategy, or with 'auto' escalates until a complete schedule is found.
+# When none is complete, the attempt that placed the most courses is returned (earliest on a tie).
+def run_initial_scheduler(graph, strategy='auto', instrument=None, slots=SLOTS):
+    names = AUTO_ORDER if strategy == 'auto' else [strategy]
+    if any(name not in INITIAL_SCHEDULERS for name in names):
+        raise ValueError(f"Unknown initial scheduler: {strategy}")
+
+    attempts, best = [], None
+    for name in names:
+        start = time.perf_counter()
+        schedule, tried = INITIAL_SCHEDULERS[name](graph, slots=slots)
+        report = {'strategy': name, 'seconds': time.perf_counter() - start, 'placements_tried': tried,
+                  'placed': len(schedule), 'total': len(graph.nodes)}
+        attempts.append(report)
+        if instrument is not None: instrument.count('placement_checks', tried)
+        print(f"[Scheduler] {name}: {report['placed']}/{report['total']} placed in "
+              f"{report['seconds']:.3f}s ({tried} placements tried)")
+        if best is None or report['placed'] > best[1]['placed']: best = (schedule, report)
+        if report['placed'] == report['total']: break
+
+    schedule, report = best
+    return schedule, {**report, 'attempts': attempts}
@@ -0,0 +1,115 @@
+from config import SLOTS
+
+# INCREMENTAL SCORING: Keeps the inequity objective in sync with a schedule so moves cost O(affected)
+class ScoreState:
+    def __init__(self, graph, schedule, student_data=None, slots=SLOTS):
+        self.slots = slots
+        self.days = slots.days
+        self.weight = slots.weight
+        self.credits = {c: graph.nodes[c].get('credits', 0) for c in graph.nodes}
+
+        # Reverse index: a student appears once per enrollment so duplicate codes weigh like the full scan
+        self.course_students = {c: [] for c in graph.nodes}
+        self.student_load = {}
+        for sid, courses in (student_data or {}).items():
+            self.student_load[sid] = [0] * len(self.days)
+            for c in courses:
+                if c in self.course_students: self.course_students[c].append(sid)
+
+        self.assigned = {}
+        self.day_load = [0] * len(self.days)
+        for course, slot in schedule.items():
+            self._place(course, slots.day_of(slot))
+
+        # Totals never change under move or swap, so variance reduces to tracking sums of squares
+        self.glob_sq = sum(x * x for x in self.day_load)
+        self.stud_sq = sum(x * x for load in self.student_load.values() for x in load)
+        self.glob_total = sum(self.day_load)
+        self.stud_total_sq = sum(sum(load) ** 2 for load in self.student_load.values())
+        self.journal = []
+
+    def _place(self, course, day_idx):
+        cr = self.credits[course]
+        self.assigned[course] = day_idx
+        self.day_load[day_idx] += cr
+        for sid in self.course_students[course]:
+            self.student_load[sid][day_idx] += cr
+
+    def _shift(self, course, new_idx):
+        old_idx = self.assigned[course]
+        if old_idx == new_idx: return 0
+        cr = self.credits[course]
+        load = self.day_load
+        d_glob = 2 * cr * (load[new_idx] - load[old_idx] + cr)
+        load[old_idx] -= cr
+        load[new_idx] += cr
+
+        d_stud = 0
+        for sid in self.course_students[course]:
+            s_load = self.student_load[sid]
+            d_stud += 2 * cr * (s_load[new_idx] - s_load[old_idx] + cr)
+            s_load[old_idx] -= cr
+            s_load[new_idx] += cr
+
+        self.assigned[course] = new_idx
+        self.glob_sq += d_glob
+        self.stud_sq += d_stud
+        self.journal.append((course, old_idx))
+        return d_glob + (self.weight * d_stud)
+
+    # MEMBERSHIP EDITS: Take a course out of the sums or put it back in O(enrolled); used when a course's
+    # credits or enrollments change under a live schedule. Call with an empty journal.
+    def unplace(self, course):
+        day_idx = self.assigned.pop(course, None)
+        if day_idx is not None: self._adjust(course, day_idx, -self.credits[course])
+
+    def place(self, course, slot):
+        day_idx = self.slots.day_of(slot)
+        self.assigned[course] = day_idx
+        self._adjust(course, day_idx, self.credits[course])
+
+    def _adjust(self, course, day_idx, cr):
+        load = self.day_load[day_idx]
+        self.glob_sq += 2 * cr * load + cr * cr
+        self.glob_total += cr
+        self.day_load[day_idx] += cr
+        for sid in self.course_students[course]:
+            s_load = self.student_load[sid]
+            total = sum(s_load)
+            self.stud_sq += 2 * cr * s_load[day_idx] + cr * cr
+            self.stud_total_sq += 2 * cr * total + cr * cr
+            s_load[day_idx] += cr
+
+    # An unplaced course's credits and students may be redefined; students=None drops the course entirely
+    def set_course(self, course, credits, students):
+        if course in self.assigned: raise ValueError(f"Course {course} must be unplaced first")
+        if students is None:
+            self.credits.pop(course, None)
+            self.course_students.pop(course, None)
+            return
+        self.credits[course] = credits
+        self.course_students[course] = list(students)
+        for sid in students: self.student_load.setdefault(sid, [0] * len(self.days))
+
+    def score(self):
+        k = len(self.days)
+        glob_var = self.glob_sq - (self.glob_total ** 2) / k
+        stud_var = self.stud_sq - self.stud_total_sq / k
+        return glob_var + (self.weight * stud_var)
+
+    # Apply a candidate and return the score delta; follow with commit() or rollback()
+    def apply_move(self, course, slot):
+        return self._shift(course, self.slots.day_of(slot))
+
+    def apply_swap(self, c1, c2):
+        day1, day2 = self.assigned[c1], self.assigned[c2]
+        return self._shift(c1, day2) + self._shift(c2, day1)
+
+    def commit(self):
+        self.journal = []
+
+    def rollback(self):
+        journal, self.journal = self.journal, []
+        for course, old_idx in reversed(journal):
+            self._shift(course, old_idx)
+        self.journal = []
@@ -0,0 +1,213 @@
+import os
+import csv
+import json
+import uuid
+import sqlite3
+import itertools
+import contextlib
+
+COURSE_FIELDS = ('name', 'lecturer', 'credits', 'required_room', 'sem')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS courses (
+    code TEXT PRIMARY KEY, name TEXT, lecturer TEXT, credits INTEGER, required_room TEXT, sem INTEGER, extra TEXT
+);
+CREATE TABLE IF NOT EXISTS students (sid TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS enrollments (sid TEXT NOT NULL, course TEXT NOT NULL, PRIMARY KEY (sid, course));
+CREATE INDEX IF NOT EXISTS idx_courses_lecturer ON courses (lecturer);
+CREATE INDEX IF NOT EXISTS idx_courses_room ON courses (required_room);
+CREATE INDEX IF NOT EXISTS idx_courses_sem ON courses (sem);
+CREATE INDEX IF NOT EXISTS idx_enrollments_course ON enrollments (course);
+"""
+
+def _course_row(code, detail):
+    extra = {k: v for k, v in detail.items() if k not in COURSE_FIELDS}
+    return (code, *(detail.get(f) for f in COURSE_FIELDS), json.dumps(extra) if extra else None)
+
+def _course_detail(row):
+    detail = {f: v for f, v in zip(COURSE_FIELDS, row[1:6]) if v is not None}
+    if row[6]: detail.update(json.loads(row[6]))
+    return row[0], detail
+
+# CSV COURSES: The bulk-import layout CODE,LECTURER,CREDITS,ROOM with optional NAME,SEM header columns
+def read_courses_csv(filename):
+    courses = {}
+    with open(filename, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            row = {k.strip().upper(): (v or '').strip() for k, v in row.items() if k}
+            detail = {'lecturer': row['LECTURER'].upper(), 'credits': int(row['CREDITS']),
+                      'required_room': row['ROOM'].upper()}
+            if row.get('NAME'): detail = {'name': row['NAME'], **detail}
+            if row.get('SEM'): detail['sem'] = int(row['SEM'])
+            courses[row['CODE'].upper()] = detail
+    return courses
+
+# LAZY TABLE VIEWS: Dict-shaped (items/keys/len) read-only views that re-query on every pass,
+# so the graph builder streams rows instead of receiving materialized JSON dicts
+class _CourseView:
+    def __init__(self, store): self.store = store
+    def items(self): return self.store.iter_courses()
+    def keys(self): return (code for code, _ in self.store.iter_courses())
+    def __iter__(self): return iter(self.keys())
+    def __len__(self): return self.store.count('courses')
+
+class _StudentView:
+    def __init__(self, store): self.store = store
+    def items(self): return self.store.iter_enrollments()
+    def keys(self): return (sid for sid, _ in self.store.iter_enrollments())
+    def __iter__(self): return iter(self.keys())
+    def __len__(self): return self.store.count('students')
+
+# COURSE / STUDENT STORE: Embedded SQLite with indexed lookups, batched upserts and atomic transactions.
+# Row order follows first insertion, matching the key order of the JSON files it replaces.
+class ScheduleStore:
+    def __init__(self, filename='scheduler.db'):
+        self.filename = filename
+        # Autocommit mode: transaction() issues BEGIN/COMMIT itself instead of the driver's implicit ones
+        self.conn = sqlite3.connect(filename, isolation_level=None)
+        self.conn.executescript(SCHEMA)
+        # Only a new database is written on open, so opening never waits on another writer's lock
+        if self.conn.execute("SELECT COUNT(*) FROM meta").fetchone()[0] < 2:
+            self.conn.execute("INSERT OR IGNORE INTO meta VALUES ('store_id', ?)", (uuid.uuid4().hex,))
+            self.conn.execute("INSERT OR IGNORE INTO meta VALUES ('revision', '0')")
+
+    def close(self):
+        self.conn.close()
+
+    # Every write goes through one transaction: all of it lands, or none of it does
+    @contextlib.contextmanager
+    def transaction(self):
+        # BEGIN stays outside the rollback: a locked database raises its own error, with nothing to undo
+        self.conn.execute("BEGIN IMMEDIATE")
+        cur = self.conn.cursor()
+        try:
+            yield cur
+            cur.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'revision'")
+            cur.execute("COMMIT")
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+        finally:
+            cur.close()
+
+    # The store id plus the revision counter identify the contents for the compiled-instance cache
+    def fingerprint(self):
+        meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        return f"{meta['store_id']}:{meta['revision']}"
+
+    def count(self, table):
+        if table not in ('courses', 'students', 'enrollments'): raise ValueError(f"Unknown table: {table}")
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    # COURSES
+    def upsert_courses(self, courses):
+        with self.transaction() as cur: return self._upsert_courses(cur, courses)
+
+    def _upsert_courses(self, cur, courses):
+        rows = [_course_row(code, detail) for code, detail in courses.items()]
+        cur.executemany("""
+            INSERT INTO courses VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (code) DO UPDATE SET name = excluded.name, lecturer = excluded.lecturer,
+                credits = excluded.credits, required_room = excluded.required_room, sem = excluded.sem,
+                extra = excluded.extra
+        """, rows)
+        return len(rows)
+
+    def upsert_course(self, code, detail):
+        return self.upsert_courses({code: detail})
+
+    def remove_course(self, code):
+        with self.transaction() as cur:
+            cur.execute("DELETE FROM courses WHERE code = ?", (code,))
+            cur.execute("DELETE FROM enrollments WHERE course = ?", (code,))
+
+    def course(self, code):
+        row = self.conn.execute("SELECT * FROM courses WHERE code = ?", (code,)).fetchone()
+        return _course_detail(row)[1] if row else None
+
+    def iter_courses(self):
+        for row in self.conn.execute("SELECT * FROM courses ORDER BY rowid"):
+            yield _course_detail(row)
+
+    def courses_by(self, lecturer=None, room=None, sem=None):
+        clauses, params = [], []
+        for column, value in (('lecturer', lecturer), ('required_room', room), ('sem', sem)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return dict(_course_detail(row) for row in
+                    self.conn.execute(f"SELECT * FROM courses{where} ORDER BY rowid", params))
+
+    # ENROLLMENTS: Setting a student's list replaces it; codes of unknown courses are kept, as in the JSON store
+    def set_enrollments(self, enrollments):
+        with self.transaction() as cur: return self._set_enrollments(cur, enrollments)
+
+    def _set_enrollments(self, cur, enrollments):
+        for sid, codes in enrollments.items():
+            cur.execute("INSERT OR IGNORE INTO students VALUES (?)", (sid,))
+            cur.execute("DELETE FROM enrollments WHERE sid = ?", (sid,))
+            cur.executemany("INSERT OR IGNORE INTO enrollments VALUES (?, ?)", ((sid, c) for c in codes))
+        return len(enrollments)
+
+    def set_enrollment(self, sid, codes):
+        return self.set_enrollments({sid: codes})
+
+    def students_in(self, code):
+        return [sid for (sid,) in self.conn.execute("SELECT sid FROM enrollments WHERE course = ?", (code,))]
+
+    def iter_enrollments(self):
+        rows = self.conn.execute("""
+            SELECT s.sid, e.course FROM students s LEFT JOIN enrollments e ON e.sid = s.sid
+            ORDER BY s.rowid, e.rowid
+        """)
+        for sid, group in itertools.groupby(rows, key=lambda row: row[0]):
+            yield sid, [course for _, course in group if course is not None]
+
+    def course_view(self):
+        return _CourseView(self)
+
+    def student_view(self):
+        return _StudentView(self)
+
+    def reset(self):
+        with self.transaction() as cur:
+            for table in ('enrollments', 'students', 'courses'):
+                cur.execute(f"DELETE FROM {table}")
+
+    # BULK IMPORT: JSON migration and CSV files, each loaded in a single transaction
+    def import_json(self, courses_file='courses.json', students_file='students.json'):
+        courses, students = {}, {}
+        if os.path.exists(courses_file):
+            with open(courses_file, 'r', encoding='utf-8') as f: courses = json.load(f)
+        if os.path.exists(students_file):
+            with open(students_file, 'r', encoding='utf-8') as f: students = json.load(f)
+        # Courses and enrollments land together, so a failed import never leaves courses without students
+        with self.transaction() as cur:
+            self._upsert_courses(cur, courses)
+            self._set_enrollments(cur, students)
+        return len(courses), len(students)
+
+    def export_json(self, courses_file='courses.json', students_file='students.json'):
+        with open(courses_file, 'w', encoding='utf-8') as f: json.dump(dict(self.iter_courses()), f, indent=4)
+        with open(students_file, 'w', encoding='utf-8') as f: json.dump(dict(self.iter_enrollments()), f, indent=4)
+
+    def import_courses_csv(self, filename):
+        return self.upsert_courses(read_courses_csv(filename))
+
+    # Enrollment rows are STUDENT,COURSE pairs; each listed student's enrollments are replaced
+    def import_enrollments_csv(self, filename):
+        enrollments = {}
+        with open(filename, 'r', newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                row = {k.strip().upper(): (v or '').strip() for k, v in row.items() if k}
+                enrollments.setdefault(row['STUDENT'].upper(), []).append(row['COURSE'].upper())
+        return self.set_enrollments(enrollments)
+
+# FIRST OPEN: A new database is seeded once from the legacy JSON files when they exist
+def open_store(filename='scheduler.db', courses_file='courses.json', students_file='students.json'):
+    seed = not os.path.exists(filename)
+    store = ScheduleStore(filename)
+    if seed: store.import_json(courses_file, students_file)
+    return store
@@ -0,0 +1,43 @@
+import random
+
+# SYNTHETIC UNIVERSITY: Generates courses.json / students.json shaped instances of any size
+def generate_university(courses=200, lecturers=60, rooms=40, students=1000, courses_per_student=6,
+                        credit_weights=None, semesters=8, elective_rate=0.1, seed=0):
+    rng = random.Random(seed)
+    credit_weights = credit_weights or {2: 0.3, 3: 0.4, 4: 0.2, 5: 0.1}
+    credit_values, credit_probs = list(credit_weights), list(credit_weights.values())
+    lecturer_ids = [f"DSN-{i:03}" for i in range(lecturers)]
+    room_ids = [f"R{i:03}" for i in range(rooms)]
+
+    # Courses are dealt round-robin over semesters, lecturers and rooms so no resource is starved
+    rng.shuffle(lecturer_ids)
+    rng.shuffle(room_ids)
+    course_data, by_sem = {}, {sem: [] for sem in range(1, semesters + 1)}
+    for i in range(courses):
+        sem = i % semesters + 1
+        code = f"SYN{sem:02}{i:05}"
+        course_data[code] = {
+            'name': f"Synthetic Course {i}",
+            'lecturer': lecturer_ids[i % lecturers],
+            'credits': rng.choices(credit_values, credit_probs)[0],
+            'required_room': room_ids[(i * 7) % rooms],
+            'sem': sem
+        }
+        by_sem[sem].append(code)
+
+    # Students follow a cohort block of their semester, occasionally trading one course for an elective
+    cohorts = []
+    for codes in by_sem.values():
+        for start in range(0, len(codes), courses_per_student):
+            block = codes[start:start + courses_per_student]
+            if block: cohorts.append((block, codes))
+
+    student_data = {}
+    for i in range(students):
+        block, pool = cohorts[i % len(cohorts)] if cohorts else ([], [])
+        enrolled = list(block)
+        if enrolled and rng.random() < elective_rate:
+            options = [c for c in pool if c not in enrolled]
+            if options: enrolled[rng.randrange(len(enrolled))] = rng.choice(options)
+        student_data[f"SYN-{i:06}"] = enrolled
+    return course_data, student_data
@@ -0,0 +1,15 @@
+import os
+import sys
+import json
+import pytest
+
+# The modules live flat at the repository root; make them importable from the tests directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+@pytest.fixture
+def bundled():
+    with open(os.path.join(ROOT, 'courses.json'), 'r', encoding='utf-8') as f: courses = json.load(f)
+    with open(os.path.join(ROOT, 'students.json'), 'r', encoding='utf-8') as f:
+        students = {k: set(v) for k, v in json.load(f).items()}
+    return courses, students
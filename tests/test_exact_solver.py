@@ -0,0 +1,30 @@
+import pytest
+from config import SLOTS
+from graph_core import create_scheduling_graph, standard_greedy_coloring
+from metaheuristics import OPTIMIZER_ENGINES
+from scoring import ScoreState
+from synthetic import generate_university
+from verification import verify_schedule
+
+pytest.importorskip("ortools")
+
+# Small enough for CP-SAT to prove optimality well inside the budget, so the comparison is never a race
+@pytest.mark.parametrize("seed", [1, 2])
+def test_exact_is_feasible_and_no_worse_than_hill_climb(seed):
+    courses, students = generate_university(courses=12, lecturers=6, rooms=6, students=40, courses_per_student=3,
+                                            seed=seed)
+    students = {k: set(v) for k, v in students.items()}
+    graph = create_scheduling_graph(courses, students)
+    initial = standard_greedy_coloring(graph)
+    assert len(initial) == len(graph.nodes)
+
+    exact, _, trace = OPTIMIZER_ENGINES['exact'](graph, initial, students, time_budget=60.0)
+    climbed, _, _ = OPTIMIZER_ENGINES['hill_climb'](graph, initial, students, verbose=False)
+    assert trace[-1]['status'] == 'OPTIMAL'
+
+    report = verify_schedule(SLOTS.decode_schedule(exact), courses, students)
+    assert report['ok'], report['overlaps'] or report['work_hours'] or report['unscheduled']
+
+    exact_score = ScoreState(graph, exact, students).score()
+    assert abs(exact_score - trace[-1]['score']) <= 1e-6 * max(1.0, exact_score)
+    assert exact_score <= ScoreState(graph, climbed, students).score() + 1e-6
@@ -0,0 +1,97 @@
+import random
+from config import SLOTS
+from graph_core import create_scheduling_graph, standard_greedy_coloring
+from incremental import IncrementalScheduler
+from scoring import ScoreState
+from synthetic import generate_university
+from verification import verify_schedule
+
+def _scheduler(seed=0):
+    courses, students = generate_university(courses=150, lecturers=50, rooms=40, students=800, seed=seed)
+    students = {k: set(v) for k, v in students.items()}
+    graph = create_scheduling_graph(courses, students)
+    return IncrementalScheduler(graph, standard_greedy_coloring(graph), courses, students)
+
+# A from-scratch compile of the edited data must match the patched graph, the patched schedule must
+# verify, and the long-lived score state must equal one rebuilt from nothing
+def _assert_matches_scratch(inc):
+    scratch = create_scheduling_graph(inc.courses, inc.students)
+    graph = inc.graph
+    assert set(graph.nodes) == set(scratch.nodes)
+    for n in graph.nodes: assert graph.nodes[n] == scratch.nodes[n]
+    assert ({frozenset((u, v)): r for u, v, r in graph.edges(data='reason')} ==
+            {frozenset((u, v)): r for u, v, r in scratch.edges(data='reason')})
+    assert ({c: set(k) for c, k in graph.graph['resources'].items()} ==
+            {c: set(k) for c, k in scratch.graph['resources'].items()})
+
+    report = verify_schedule(inc.decoded_schedule(), inc.courses, inc.students)
+    assert report['overlaps'] == [] and report['work_hours'] == [] and report['unknown_courses'] == []
+    fresh = ScoreState(scratch, inc.schedule, inc.students).score()
+    assert abs(inc.score() - fresh) <= 1e-6 * max(1.0, abs(fresh))
+
+def _assert_only_moved_changed(before, inc, report):
+    for course, slot in before.items():
+        if course not in report['moved']: assert inc.schedule.get(course) == slot, course
+        else: assert report['moved'][course] == (slot, inc.schedule.get(course))
+
+def test_add_course():
+    inc = _scheduler()
+    before = dict(inc.schedule)
+    detail = dict(next(iter(inc.courses.values())), credits=3)
+    report = inc.upsert_course('NEW001', detail)
+    assert 'NEW001' in inc.schedule and report['unplaced'] == []
+    _assert_only_moved_changed(before, inc, report)
+    _assert_matches_scratch(inc)
+
+# An empty detail is accepted the way create_scheduling_graph accepts it: zero credits, default fields
+def test_add_course_with_empty_detail():
+    inc = _scheduler()
+    before = dict(inc.schedule)
+    report = inc.upsert_course('EMPTY01', {})
+    assert inc.graph.nodes['EMPTY01']['credits'] == 0
+    _assert_only_moved_changed(before, inc, report)
+    _assert_matches_scratch(inc)
+
+def test_remove_course():
+    inc = _scheduler()
+    code = next(iter(inc.courses))
+    before = dict(inc.schedule)
+    report = inc.remove_course(code)
+    assert code not in inc.schedule and code not in inc.graph
+    assert report['moved'][code] == (before[code], None)
+    _assert_only_moved_changed(before, inc, report)
+    _assert_matches_scratch(inc)
+
+def test_edit_course_and_enrollment():
+    inc = _scheduler(1)
+    code = list(inc.courses)[10]
+    before = dict(inc.schedule)
+    other = list(inc.courses.values())[40]
+    report = inc.upsert_course(code, dict(inc.courses[code], credits=5, lecturer=other['lecturer']))
+    _assert_only_moved_changed(before, inc, report)
+    _assert_matches_scratch(inc)
+
+    sid = next(iter(inc.students))
+    before = dict(inc.schedule)
+    report = inc.set_enrollment(sid, list(inc.courses)[:4])
+    _assert_only_moved_changed(before, inc, report)
+    _assert_matches_scratch(inc)
+
+def test_random_edit_sequence():
+    inc = _scheduler(2)
+    rng = random.Random(2)
+    details = list(inc.courses.values())
+    for step in range(40):
+        r = rng.random()
+        if r < 0.3:
+            inc.upsert_course(f"NEW{step}", dict(rng.choice(details), credits=rng.choice([2, 3, 4])))
+        elif r < 0.5:
+            inc.remove_course(rng.choice(list(inc.courses)))
+        elif r < 0.7:
+            code = rng.choice(list(inc.courses))
+            inc.upsert_course(code, dict(inc.courses[code], required_room=rng.choice(details)['required_room']))
+        else:
+            inc.set_enrollment(rng.choice(list(inc.students)), rng.sample(list(inc.courses), 5))
+    _assert_matches_scratch(inc)
+    assert len(inc.schedule) == len(inc.courses)
+    assert all(0 <= slot < SLOTS.slot_count for slot in inc.schedule.values())
@@ -0,0 +1,68 @@
+import random
+import pytest
+from config import SLOTS
+from graph_core import create_scheduling_graph, standard_greedy_coloring, calculate_student_load_variance
+from matrix_scoring import MatrixScorer
+from scoring import ScoreState
+from synthetic import generate_university
+
+def _close(a, b):
+    return abs(a - b) <= 1e-6 * max(1.0, abs(b))
+
+def _instances(bundled):
+    yield bundled
+    for seed in range(3):
+        courses, students = generate_university(courses=120, lecturers=40, rooms=30, students=600, seed=seed)
+        yield courses, {k: list(v) for k, v in students.items()}
+    # Repeated codes count once per enrollment in both scorers
+    courses, students = generate_university(courses=40, students=100, seed=7)
+    yield courses, {k: list(v) + list(v)[:1] for k, v in students.items()}
+
+def _schedules(graph, seed):
+    rng = random.Random(seed)
+    yield standard_greedy_coloring(graph)
+    yield {c: rng.randrange(SLOTS.slot_count) for c in graph.nodes}
+    # Unscheduled courses carry no load
+    yield {c: rng.randrange(SLOTS.slot_count) for c in graph.nodes if rng.random() < 0.7}
+
+def _cases(bundled):
+    for i, (courses, students) in enumerate(_instances(bundled)):
+        graph = create_scheduling_graph(courses, students)
+        for schedule in _schedules(graph, i):
+            yield graph, students, schedule
+
+def test_student_variance_matches_reference(bundled):
+    for graph, students, schedule in _cases(bundled):
+        scorer = MatrixScorer(graph, students)
+        reference = calculate_student_load_variance(students, schedule, graph)
+        assert _close(scorer.student_variance(scorer.assignment(schedule)), reference)
+
+def test_score_matches_score_state(bundled):
+    for graph, students, schedule in _cases(bundled):
+        scorer = MatrixScorer(graph, students)
+        assert _close(scorer.score(scorer.assignment(schedule)), ScoreState(graph, schedule, students).score())
+
+def test_move_deltas_match_apply_move(bundled):
+    for graph, students, schedule in _cases(bundled):
+        scorer = MatrixScorer(graph, students)
+        state = ScoreState(graph, schedule, students)
+        assign = scorer.assignment(schedule)
+
+        # Every scheduled course against every day, including its own (a zero delta)
+        candidates = [(c, d) for c in schedule for d in range(len(SLOTS.days))]
+        deltas = scorer.move_deltas(assign, [scorer.position[c] for c, _ in candidates],
+                                    [d for _, d in candidates])
+        assert len(deltas) == len(candidates)
+        for (course, day), delta in zip(candidates, deltas):
+            expected = state.apply_move(course, day * SLOTS.slots_per_day)
+            state.rollback()
+            assert _close(delta, expected), (course, day)
+
+@pytest.mark.parametrize('weight', [0.0, 0.25, 1.0])
+def test_weight_follows_slot_model(bundled, weight):
+    courses, students = bundled
+    slots = SLOTS.with_overrides(STUDENT_WEIGHT=weight)
+    graph = create_scheduling_graph(courses, students)
+    schedule = standard_greedy_coloring(graph, slots=slots)
+    scorer = MatrixScorer(graph, students, slots)
+    assert _close(scorer.score(scorer.assignment(schedule)), ScoreState(graph, schedule, students, slots).score())
@@ -0,0 +1,37 @@
+import random
+import pytest
+from config import SLOTS
+from graph_core import create_scheduling_graph
+from metaheuristics import OPTIMIZER_ENGINES
+from benchmarks import verify_engines, _pairwise_overlaps
+from synthetic import generate_university
+from verification import verify_schedule
+
+def _instances(bundled):
+    yield bundled
+    yield generate_university(courses=80, lecturers=30, rooms=25, students=400, seed=3)
+
+# REGRESSION ORACLE: Every engine's schedule must pass the independent sweep-line verifier
+@pytest.mark.parametrize("engine", list(OPTIMIZER_ENGINES))
+def test_engine_schedules_verify(bundled, engine):
+    for courses, students in _instances(bundled):
+        rows = verify_engines(courses, students, engines=[engine], time_budget=0.2)
+        for row in rows:
+            if 'skipped' in row: pytest.skip(f"{engine}: {row['skipped']}")
+            assert row['ok'], row
+            assert row['placed'] == len(courses)
+
+# A random placement clashes everywhere; the sweep line must find exactly the pairs the pairwise check finds
+@pytest.mark.parametrize("seed", [0, 1])
+def test_clashing_schedule_matches_pairwise(bundled, seed):
+    for courses, students in _instances(bundled):
+        students = {k: set(v) for k, v in students.items()}
+        graph = create_scheduling_graph(courses, students)
+        rng = random.Random(seed)
+        schedule = {c: SLOTS.decode(rng.randrange(SLOTS.slot_count)) for c in graph.nodes}
+
+        report = verify_schedule(schedule, courses, students)
+        expected = _pairwise_overlaps(graph, schedule)
+        assert expected and not report['ok']
+        assert {frozenset(o['courses']) for o in report['overlaps']} == expected
+        assert all(o['minutes'] > 0 for o in report['overlaps'])
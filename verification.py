@@ -0,0 +1,152 @@
+import sys
+import json
+import time
+import heapq
+import argparse
+from config import SLOTS
+
+# Double-booking is checked per lecturer and per room (from the course fields) and per enrolled student
+RESOURCE_FIELDS = (('Lecturer', 'lecturer'), ('Room', 'required_room'))
+MAX_DAILY_CREDITS = 8
+MINUTES_PER_DAY = 24 * 60
+
+def _minutes(clock):
+    hours, minutes = clock.split(':')
+    return int(hours) * 60 + int(minutes)
+
+def _clock(minutes):
+    return f"{minutes // 60:02}:{minutes % 60:02}"
+
+# INTERVALS: Every placed course becomes one [start, end) range in minutes of the week. The verifier works
+# from the course data and clock times only, never from the graph or slot bitmasks the optimizers rely on.
+def course_intervals(schedule, course_data, slots=SLOTS):
+    duration = slots.slot_duration
+    day_start, day_end = _minutes(slots.config['START_TIME']), _minutes(slots.config['END_LIMIT'])
+    intervals, work_hours, unknown = {}, [], []
+
+    for course, placement in schedule.items():
+        if course not in course_data:
+            unknown.append(course)
+            continue
+        # Integer slots are accepted too; JSON round-trips turn (day, start) tuples into lists
+        day, start = slots.decode(placement) if isinstance(placement, int) else placement
+        if day not in slots.day_index:
+            work_hours.append({'course': course, 'day': day, 'start': start, 'reason': 'unknown day'})
+            continue
+        begin = _minutes(start)
+        end = begin + course_data[course].get('credits', 0) * duration
+        if begin < day_start or end > day_end:
+            work_hours.append({'course': course, 'day': day, 'start': start, 'end': _clock(end),
+                               'reason': 'outside working hours'})
+        elif (begin - day_start) % duration:
+            work_hours.append({'course': course, 'day': day, 'start': start, 'reason': 'off the slot grid'})
+        offset = slots.day_index[day] * MINUTES_PER_DAY
+        intervals[course] = (offset + begin, offset + end)
+    return intervals, work_hours, unknown
+
+# SWEEP LINE: Intervals sorted by start; a min-heap of active end times drops finished courses, so every
+# course still on the heap overlaps the newcomer. O(m log m) for m intervals plus one step per overlap.
+def _sweep(kind, key, items, overlaps, slots):
+    active = []
+    for start, end, course in items:
+        while active and active[0][0] <= start: heapq.heappop(active)
+        for other_end, other in active:
+            overlaps.append({'resource': kind, 'key': key, 'courses': (other, course),
+                             'day': slots.days[start // MINUTES_PER_DAY], 'start': _clock(start % MINUTES_PER_DAY),
+                             'minutes': min(end, other_end) - start})
+        heapq.heappush(active, (end, course))
+
+# STUDENT METRICS: Idle minutes between classes on the same day and the heaviest day in credits
+def _student_metrics(items, duration):
+    gap, longest, daily = 0, 0, {}
+    for (start, end, _), previous in zip(items, [None] + items[:-1]):
+        day = start // MINUTES_PER_DAY
+        daily[day] = daily.get(day, 0) + (end - start) // duration
+        if previous is not None and previous[0] // MINUTES_PER_DAY == day and start > previous[1]:
+            gap += start - previous[1]
+            longest = max(longest, start - previous[1])
+    return {'gap_minutes': gap, 'longest_gap_minutes': longest, 'days': len(daily),
+            'peak_daily_credits': max(daily.values(), default=0)}
+
+def verify_schedule(schedule, course_data, student_data=None, slots=SLOTS, max_daily_credits=MAX_DAILY_CREDITS):
+    started = time.perf_counter()
+    course_data = dict(course_data.items())
+    intervals, work_hours, unknown = course_intervals(schedule, course_data, slots)
+
+    resources = {}
+    for course, (start, end) in intervals.items():
+        detail = course_data[course]
+        for kind, field in RESOURCE_FIELDS:
+            resources.setdefault((kind, detail.get(field)), []).append((start, end, course))
+
+    overlaps = []
+    for (kind, key), items in resources.items():
+        items.sort()
+        _sweep(kind, key, items, overlaps, slots)
+
+    student_metrics, overloaded = {}, []
+    for sid, courses in (student_data or {}).items():
+        # Enrollments in courses that do not exist are ignored, as they are everywhere else
+        items = sorted((*intervals[c], c) for c in set(courses) if c in intervals)
+        _sweep('Student', sid, items, overlaps, slots)
+        metrics = student_metrics[sid] = _student_metrics(items, slots.slot_duration)
+        if metrics['peak_daily_credits'] > max_daily_credits: overloaded.append(sid)
+
+    unscheduled = [c for c in course_data if c not in schedule]
+    gaps = [m['gap_minutes'] for m in student_metrics.values()]
+    return {
+        'ok': not (overlaps or work_hours or unscheduled or unknown),
+        'courses': len(course_data), 'placed': len(intervals),
+        'unscheduled': unscheduled, 'unknown_courses': unknown,
+        'overlaps': overlaps, 'work_hours': work_hours,
+        'students': {'count': len(student_metrics), 'gap_minutes': sum(gaps),
+                     'mean_gap_minutes': sum(gaps) / len(gaps) if gaps else 0.0,
+                     'longest_gap_minutes': max((m['longest_gap_minutes'] for m in student_metrics.values()),
+                                                default=0),
+                     'overloaded': overloaded, 'max_daily_credits': max_daily_credits},
+        'student_metrics': student_metrics,
+        'seconds': time.perf_counter() - started,
+    }
+
+def format_report(report, limit=10):
+    students = report['students']
+    lines = [f"[Verify] {'OK' if report['ok'] else 'FAILED'}: {report['placed']}/{report['courses']} courses placed | "
+             f"Overlaps: {len(report['overlaps'])} | Work-hour violations: {len(report['work_hours'])} | "
+             f"{report['seconds'] * 1000:.1f} ms",
+             f"[Verify] Students: {students['count']} | Mean gap: {students['mean_gap_minutes']:.1f} min | "
+             f"Longest gap: {students['longest_gap_minutes']} min | "
+             f"Over {students['max_daily_credits']} SKS/day: {len(students['overloaded'])}"]
+    if report['unscheduled']: lines.append(f"  Unscheduled: {', '.join(report['unscheduled'][:limit])}")
+    if report['unknown_courses']: lines.append(f"  Unknown courses: {', '.join(report['unknown_courses'][:limit])}")
+    for o in report['overlaps'][:limit]:
+        lines.append(f"  Overlap [{o['resource']} {o['key']}]: {o['courses'][0]} / {o['courses'][1]} "
+                     f"on {o['day']} {o['start']} ({o['minutes']} min)")
+    for w in report['work_hours'][:limit]:
+        lines.append(f"  Work hours: {w['course']} at {w['day']} {w['start']} ({w['reason']})")
+    hidden = max(0, len(report['overlaps']) - limit) + max(0, len(report['work_hours']) - limit)
+    if hidden: lines.append(f"  ... {hidden} more")
+    return "\n".join(lines)
+
+# COMMAND LINE: Checks a saved schedule (a batch --summary file or a bare {course: [day, start]} map)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify a finished schedule")
+    parser.add_argument('schedule', help="Schedule JSON; a batch summary's 'schedule' key is used if present")
+    parser.add_argument('--courses', default='courses.json')
+    parser.add_argument('--students', default='students.json')
+    parser.add_argument('--max-daily-credits', type=int, default=MAX_DAILY_CREDITS)
+    parser.add_argument('--output', default=None, help="Write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    with open(args.schedule, 'r', encoding='utf-8') as f: schedule = json.load(f)
+    schedule = schedule.get('schedule', schedule)
+    with open(args.courses, 'r', encoding='utf-8') as f: courses = json.load(f)
+    with open(args.students, 'r', encoding='utf-8') as f: students = json.load(f)
+
+    report = verify_schedule(schedule, courses, students, max_daily_credits=args.max_daily_credits)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f: json.dump(report, f, indent=4)
+    sys.exit(0 if report['ok'] else 1)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
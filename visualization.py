@@ -1,22 +1,108 @@
+import os
+import pickle
+import hashlib
 import networkx as nx
-import matplotlib
-import matplotlib.pyplot as plt
-from matplotlib.patches import Patch
-from config import (
-    CONFIG, 
-    AVAILABLE_START_TIMES, 
-    get_duration_minutes, 
-    get_end_time
-)
+from concurrent.futures import ProcessPoolExecutor
+from config import SLOTS
 
 # --- GLOBAL SETTINGS ---
-# Set the backend to Agg to allow image generation without a display server
-matplotlib.use('Agg')
+# Matplotlib is imported on first draw so headless runs without images never pay its startup cost.
+# The Agg backend allows image generation without a display server.
+def _pyplot():
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+# --- LAYOUT CACHE ---
+# Spring layout is computed once per node/edge set and reused by every graph rendering
+SPRING_LAYOUT_LIMIT = 2000
+# Past this many courses per-node labels are unreadable and the pipeline switches to summary views
+LARGE_GRAPH_LIMIT = 300
+LAYOUT_SKIP_LIMIT = 20000
+# Layouts kept in memory (least recently used dropped first) and in the cache file (oldest written dropped
+# first; a disk hit is not rewritten, so reads stay free of file writes)
+LAYOUT_CACHE_ENTRIES = 16
+_LAYOUT_CACHE = {}
+
+def _remember(cache, key, pos):
+    cache.pop(key, None)
+    cache[key] = pos
+    while len(cache) > LAYOUT_CACHE_ENTRIES: del cache[next(iter(cache))]
+
+def graph_layout_key(graph):
+    digest = hashlib.sha256()
+    digest.update(repr(sorted(map(str, graph.nodes()))).encode('utf-8'))
+    digest.update(repr(sorted(tuple(sorted((str(u), str(v)))) for u, v in graph.edges())).encode('utf-8'))
+    return digest.hexdigest()
+
+def compute_layout(graph, cache_file=None):
+    if len(graph) > LAYOUT_SKIP_LIMIT:
+        return None
+    key = graph_layout_key(graph)
+    if key in _LAYOUT_CACHE:
+        pos = _LAYOUT_CACHE[key]
+        _remember(_LAYOUT_CACHE, key, pos)
+        return pos
+
+    disk = {}
+    if cache_file and os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'rb') as f: disk = pickle.load(f)
+        except Exception as e:
+            print(f"[Warning] Layout cache unreadable, recomputing: {e}")
+    if key in disk:
+        _remember(_LAYOUT_CACHE, key, disk[key])
+        return disk[key]
+
+    # Past the spring limit a circular layout keeps rendering linear in the graph size
+    if len(graph) > SPRING_LAYOUT_LIMIT:
+        pos = nx.circular_layout(graph)
+    else:
+        pos = nx.spring_layout(graph, seed=42)
+    _remember(_LAYOUT_CACHE, key, pos)
+
+    if cache_file:
+        _remember(disk, key, pos)
+        os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+        tmp = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f: pickle.dump(disk, f)
+        os.replace(tmp, cache_file)
+    return pos
+
+# --- PARALLEL RENDERING ---
+# Runs chart jobs on a process pool so they overlap the optimizer; inline when parallel is off
+class RenderQueue:
+    def __init__(self, parallel=True, workers=2):
+        self.pool = ProcessPoolExecutor(max_workers=workers) if parallel else None
+        self.jobs = []
+
+    def submit(self, fn, *args):
+        if self.pool is None:
+            fn(*args)
+        else:
+            self.jobs.append(self.pool.submit(fn, *args))
+
+    def wait(self):
+        if self.pool is None: return
+        try:
+            for job in self.jobs:
+                try:
+                    job.result()
+                except Exception as e:
+                    print(f"[Error] Rendering failed: {e}")
+        finally:
+            self.pool.shutdown()
+            self.pool, self.jobs = None, []
 
 # --- CONFLICT NETWORK VISUALIZATION ---
 # Generates a graph showing courses as nodes and constraints as connecting edges
-def visualize_conflict_graph(graph, filename='conflict_graph.png'):
-    pos = nx.spring_layout(graph, seed=42)
+def visualize_conflict_graph(graph, filename='conflict_graph.png', pos=None):
+    pos = pos if pos is not None else compute_layout(graph)
+    if pos is None:
+        print(f"[Skipped] Conflict graph too large to draw ({len(graph)} nodes): {filename}")
+        return
+    plt = _pyplot()
     plt.figure(figsize=(12, 8))
     plt.title("Course Conflict Network Structure")
 
@@ -25,7 +111,7 @@ def visualize_conflict_graph(graph, filename='conflict_graph.png'):
     nx.draw_networkx_nodes(graph, pos, node_size=node_sizes, node_color='skyblue', 
                            edgecolors='black', alpha=0.8)
     nx.draw_networkx_edges(graph, pos, edge_color='silver', alpha=0.5)
-    nx.draw_networkx_labels(graph, pos, font_size=9)
+    if len(graph) <= LARGE_GRAPH_LIMIT: nx.draw_networkx_labels(graph, pos, font_size=9)
 
     plt.axis('off')
     plt.savefig(filename, dpi=150, bbox_inches='tight')
@@ -34,8 +120,13 @@ def visualize_conflict_graph(graph, filename='conflict_graph.png'):
 
 # --- SCHEDULING COLOR MAP ---
 # Maps the final schedule results onto the graph topology using colors for time slots
-def visualize_colored_graph(graph, coloring_result, filename='colored_graph.png'):
-    pos = nx.spring_layout(graph, seed=42)
+def visualize_colored_graph(graph, coloring_result, filename='colored_graph.png', pos=None):
+    pos = pos if pos is not None else compute_layout(graph)
+    if pos is None:
+        print(f"[Skipped] Colored graph too large to draw ({len(graph)} nodes): {filename}")
+        return
+    plt = _pyplot()
+    from matplotlib.patches import Patch
     fig, ax = plt.subplots(figsize=(14, 10))
     ax.set_title("Final Scheduling Results (Graph Coloring)")
 
@@ -48,7 +139,7 @@ def visualize_colored_graph(graph, coloring_result, filename='colored_graph.png'
     cmap = plt.colormaps.get_cmap('Spectral').resampled(len(all_slots))
 
     nx.draw_networkx(graph, pos, node_color=node_colors, cmap=cmap, node_size=400,
-                    with_labels=True, font_size=7, edge_color='gray', alpha=0.8, ax=ax)
+                    with_labels=len(graph) <= LARGE_GRAPH_LIMIT, font_size=7, edge_color='gray', alpha=0.8, ax=ax)
 
     legend_elements = [
         Patch(facecolor=cmap(i / (len(all_slots) - 1) if len(all_slots) > 1 else 0),
@@ -64,11 +155,110 @@ def visualize_colored_graph(graph, coloring_result, filename='colored_graph.png'
     plt.close()
     print(f"Colored graph saved to: {filename}")
 
+# --- LARGE-INSTANCE VIEWS ---
+# Above LARGE_GRAPH_LIMIT courses, groups and a heatmap replace the per-node drawings
+GROUP_ATTRIBUTES = ('lecturer', 'room', 'sem')
+OTHER_GROUP = '(other)'
+# Bundles of different reasons between the same two groups are bent apart so each stays visible
+REASON_STYLES = {'Lecturer': ('crimson', 0.0), 'Room': ('royalblue', 0.2), 'Student': ('seagreen', -0.2)}
+
+# Collapses courses into lecturer/room/sem groups; every conflict edge between two groups lands in one
+# bundle per reason, and conflicts inside a group are counted on the group itself. Linear in the edges.
+def aggregate_conflicts(graph, by='lecturer', max_groups=40):
+    if by not in GROUP_ATTRIBUTES: raise ValueError(f"Unknown grouping: {by}")
+    sizes = {}
+    for _, data in graph.nodes(data=True):
+        key = str(data.get(by, 'N/A'))
+        sizes[key] = sizes.get(key, 0) + 1
+    # The largest groups keep their own node; the tail is folded into one bucket
+    keep = set(sorted(sizes, key=lambda g: (-sizes[g], g))[:max_groups])
+    owner = {}
+    for course, data in graph.nodes(data=True):
+        key = str(data.get(by, 'N/A'))
+        owner[course] = key if key in keep else OTHER_GROUP
+
+    groups, bundles = {}, {}
+    for course, data in graph.nodes(data=True):
+        entry = groups.setdefault(owner[course], {'courses': 0, 'credits': 0, 'internal': {}})
+        entry['courses'] += 1
+        entry['credits'] += data.get('credits', 0)
+    for u, v, reason in graph.edges(data='reason', default=''):
+        a, b = owner[u], owner[v]
+        counts = groups[a]['internal'] if a == b else bundles.setdefault(tuple(sorted((a, b))), {})
+        for r in reason.split(', '):
+            if r: counts[r] = counts.get(r, 0) + 1
+    return groups, bundles
+
+def visualize_aggregated_conflicts(graph, filename='conflict_summary.png', by='lecturer', max_groups=40):
+    groups, bundles = aggregate_conflicts(graph, by, max_groups)
+    summary = nx.Graph()
+    summary.add_nodes_from(groups)
+    summary.add_edges_from(bundles)
+    pos = nx.spring_layout(summary, seed=42)
+
+    plt = _pyplot()
+    from matplotlib.lines import Line2D
+    fig, ax = plt.subplots(figsize=(14, 10))
+    ax.set_title(f"Conflict Summary by {by.title()} ({len(graph)} courses, {graph.number_of_edges()} conflicts)")
+
+    largest = max(g['courses'] for g in groups.values())
+    nx.draw_networkx_nodes(summary, pos, ax=ax, node_color='skyblue', edgecolors='black', alpha=0.8,
+                           node_size=[200 + 1800 * groups[g]['courses'] / largest for g in summary.nodes()])
+    labels = {g: f"{g}\n{groups[g]['courses']} MK, {sum(groups[g]['internal'].values())} internal" for g in groups}
+    nx.draw_networkx_labels(summary, pos, labels=labels, font_size=7, ax=ax)
+
+    peak = max((n for counts in bundles.values() for n in counts.values()), default=1)
+    handles = []
+    for reason, (color, rad) in REASON_STYLES.items():
+        edges = [pair for pair, counts in bundles.items() if reason in counts]
+        if not edges: continue
+        nx.draw_networkx_edges(summary, pos, edgelist=edges, edge_color=color, alpha=0.6, ax=ax,
+                               width=[0.5 + 5 * bundles[e][reason] / peak for e in edges],
+                               arrows=True, arrowstyle='-', connectionstyle=f'arc3,rad={rad}')
+        handles.append(Line2D([0], [0], color=color, lw=2,
+                              label=f"{reason} ({sum(bundles[e][reason] for e in edges)})"))
+
+    if handles: ax.legend(handles=handles, title='Conflict Reason', loc='upper left', bbox_to_anchor=(1, 1))
+    ax.axis('off')
+    plt.savefig(filename, dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"Conflict summary saved to: {filename}")
+
+# Day x start-time grid of concurrently running courses; a course fills every cell its credits span
+def occupancy_matrix(graph, coloring_result, slots=SLOTS):
+    matrix = [[0] * slots.slots_per_day for _ in slots.days]
+    for course, (day, start) in coloring_result.items():
+        row, col = slots.day_index[day], slots.start_index[start]
+        for cell in range(col, min(col + graph.nodes[course].get('credits', 0), slots.slots_per_day)):
+            matrix[row][cell] += 1
+    return matrix
+
+def visualize_occupancy_heatmap(graph, coloring_result, filename='occupancy_heatmap.png', slots=SLOTS):
+    matrix = occupancy_matrix(graph, coloring_result, slots)
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(max(10, slots.slots_per_day * 0.9), 2 + len(slots.days) * 0.8))
+    image = ax.imshow(matrix, cmap='YlOrRd', aspect='auto')
+    ax.set_xticks(range(slots.slots_per_day))
+    ax.set_xticklabels(slots.start_times, rotation=45)
+    ax.set_yticks(range(len(slots.days)))
+    ax.set_yticklabels(slots.days)
+    peak = max(max(row) for row in matrix) or 1
+    for r, row in enumerate(matrix):
+        for c, value in enumerate(row):
+            ax.text(c, r, value, ha='center', va='center', fontsize=8,
+                    color='white' if value > peak / 2 else 'black')
+    fig.colorbar(image, ax=ax, label='Concurrent Courses')
+    ax.set_title(f"Slot Occupancy ({len(coloring_result)} courses)")
+    plt.savefig(filename, dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"Occupancy heatmap saved to: {filename}")
+
 # --- CREDIT LOAD ANALYSIS ---
 # Produces a bar chart comparing total credit distribution against the weekly average
-def visualize_credits_load(daily_load, filename='credits_load.png'):
-    days = CONFIG['DAYS']
+def visualize_credits_load(daily_load, filename='credits_load.png', slots=SLOTS):
+    days = slots.days
     credit_counts = [daily_load.get(day, 0) for day in days]
+    plt = _pyplot()
 
     plt.figure(figsize=(10, 6))
     plt.bar(days, credit_counts, color='darkslateblue')
@@ -84,17 +274,46 @@ def visualize_credits_load(daily_load, filename='credits_load.png'):
     plt.close()
     print(f"Credit load chart saved to: {filename}")
 
+# --- TEXT REPORT PAGING ---
+# Reports are generators of sections, each a line count and a function that builds those lines. A page
+# skips whole sections by their count and only formats the ones it overlaps, so page k of a large report
+# costs one cheap count per earlier section rather than rendering it. page=None prints the whole report.
+def report_page(sections, page=1, page_size=100):
+    first, last = (page - 1) * page_size, page * page_size
+    shown, line = [], 0
+    for count, build in sections:
+        if line >= last: break
+        if line + count > first:
+            shown.extend(build()[max(0, first - line):last - line])
+        line += count
+    return shown
+
+def report_lines(sections):
+    for _, build in sections: yield from build()
+
+def _section(lines):
+    return len(lines), lambda: lines
+
+def _print_report(sections, page, page_size):
+    if page is None:
+        for line in report_lines(sections): print(line)
+        return
+    shown = report_page(sections, page, page_size)
+    for line in shown: print(line)
+    first = (page - 1) * page_size + 1
+    print(f"[Page {page}] Lines {first}-{first + len(shown) - 1}" if shown else f"[Page {page}] No more lines")
+
 # --- UNIVERSITY MASTER TABLE ---
 # Renders a complete, formatted ASCII matrix of all scheduled courses
-def visualize_schedule_matrix(graph, coloring_result):
-    days = CONFIG['DAYS']
-    times = AVAILABLE_START_TIMES
+def schedule_matrix_sections(graph, coloring_result, slots=SLOTS):
+    days = slots.days
+    times = slots.start_times
     cell_map = {d: {t: [] for t in times} for d in days}
 
     for course, (day, start) in coloring_result.items():
         if day in days and start in cell_map[day]:
             credits = graph.nodes[course]['credits']
-            end = get_end_time(start, get_duration_minutes(credits))
+            end = slots.end_time(start, credits)
             cell_map[day][start].append(f"{course} ({credits} SKS, {start}-{end})")
 
     col_widths = {d: max(len(d), 25) for d in days}
@@ -108,44 +327,62 @@ def visualize_schedule_matrix(graph, coloring_result):
     total_w = time_w + sum(col_widths.values()) + (len(days) * 3) + 2
     sep = "=" * total_w
 
-    print(f"\n{sep}\n{' UNIVERSITY MASTER SCHEDULE '.center(total_w, '=')}\n{sep}")
-    header = f"{'Time':<{time_w}}" + "".join([f" | {d.ljust(col_widths[d])}" for d in days])
-    print(header + f"\n{'-' * total_w}")
+    yield _section(["", sep, ' UNIVERSITY MASTER SCHEDULE '.center(total_w, '='), sep,
+                    f"{'Time':<{time_w}}" + "".join([f" | {d.ljust(col_widths[d])}" for d in days]),
+                    '-' * total_w])
 
-    for t in times:
-        max_depth = max(len(cell_map[d][t]) for d in days)
+    def time_row(t, max_depth):
+        lines = []
         for i in range(max_depth):
             row = f"{t.ljust(time_w)}" if i == 0 else " " * time_w
             for d in days:
                 content = cell_map[d][t][i] if i < len(cell_map[d][t]) else ""
                 row += f" | {content.ljust(col_widths[d])}"
-            print(row)
-        if max_depth > 0: print("-" * total_w)
+            lines.append(row)
+        return lines + ["-" * total_w]
+
+    for t in times:
+        max_depth = max(len(cell_map[d][t]) for d in days)
+        if max_depth > 0: yield max_depth + 1, lambda t=t, depth=max_depth: time_row(t, depth)
+
+def schedule_matrix_lines(graph, coloring_result, slots=SLOTS):
+    return report_lines(schedule_matrix_sections(graph, coloring_result, slots))
+
+def visualize_schedule_matrix(graph, coloring_result, slots=SLOTS, page=None, page_size=100):
+    _print_report(schedule_matrix_sections(graph, coloring_result, slots), page, page_size)
 
 # --- STUDENT INDIVIDUAL REPORTS ---
 # Generates personalized time tables for every student in the dataset
-def visualize_student_schedules(student_data, coloring_result, graph):
-    days = CONFIG['DAYS']
-    times = AVAILABLE_START_TIMES
+def student_schedule_sections(student_data, coloring_result, graph, slots=SLOTS):
+    days = slots.days
+    times = slots.start_times
     col_w, time_w = 28, 7
     total_w = time_w + (len(days) * (col_w + 3)) + 1
 
-    print("\n" + "#" * 60 + f"\n{' INDIVIDUAL STUDENT REPORTS '.center(60, '#')}\n" + "#" * 60)
+    yield _section(["", "#" * 60, ' INDIVIDUAL STUDENT REPORTS '.center(60, '#'), "#" * 60])
 
-    for sid, courses in student_data.items():
+    def student_block(sid, courses):
         grid = {d: {t: "" for t in times} for d in days}
         for c in courses:
             if c in coloring_result:
                 d, s = coloring_result[c]
                 cred = graph.nodes[c]['credits']
-                grid[d][s] = f"{c} ({s}-{get_end_time(s, get_duration_minutes(cred))})"
-
-        print(f"\n[ Student ID: {sid} ]\n{'-' * total_w}")
-        header = f"{'Time':<{time_w}}" + "".join([f" | {d.ljust(col_w)}" for d in days])
-        print(f"{header}\n{'-' * total_w}")
+                grid[d][s] = f"{c} ({s}-{slots.end_time(s, cred)})"
 
+        lines = ["", f"[ Student ID: {sid} ]", '-' * total_w,
+                 f"{'Time':<{time_w}}" + "".join([f" | {d.ljust(col_w)}" for d in days]), '-' * total_w]
         for t in times:
             if any(grid[d][t] != "" for d in days):
-                row = f"{t.ljust(time_w)}" + "".join([f" | {grid[d][t].ljust(col_w)}" for d in days])
-                print(row)
-        print("-" * total_w)
\ No newline at end of file
+                lines.append(f"{t.ljust(time_w)}" + "".join([f" | {grid[d][t].ljust(col_w)}" for d in days]))
+        return lines + ["-" * total_w]
+
+    # Six frame lines plus one row per distinct start time the student attends
+    for sid, courses in student_data.items():
+        starts = {coloring_result[c][1] for c in courses if c in coloring_result}
+        yield 6 + len(starts), lambda sid=sid, courses=courses: student_block(sid, courses)
+
+def student_schedule_lines(student_data, coloring_result, graph, slots=SLOTS):
+    return report_lines(student_schedule_sections(student_data, coloring_result, graph, slots))
+
+def visualize_student_schedules(student_data, coloring_result, graph, slots=SLOTS, page=None, page_size=100):
+    _print_report(student_schedule_sections(student_data, coloring_result, graph, slots), page, page_size)